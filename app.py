@@ -1,4 +1,5 @@
 import streamlit as st
+import asyncio
 import datetime
 import pandas as pd
 import numpy as np
@@ -11,6 +12,12 @@ import visualizer as vis
 import report_generator as rg
 import dummy_data as dd
 import integrations as intgr
+import position_sizing as ps
+import order_simulator as osim
+from journal_store import get_journal_store
+import portfolio_optimizer as popt
+import streaming as stream
+from data_service import DATA_SERVICE
 from esg_utils import estimate_carbon_footprint_kg
 from usage_logging import log_usage_event
 
@@ -95,8 +102,7 @@ def main():
     
     # --- Data Retrieval ---
     with st.spinner('Fetching market data...'):
-        df_prices = te.get_price_data(stock_code, timeframe)
-        df_ind = te.compute_indicators(df_prices)
+        df_ind = DATA_SERVICE.indicators(stock_code, timeframe)
 
     if df_ind.empty:
         st.error("Data tidak tersedia untuk emiten ini. Silakan coba kode lain.")
@@ -125,7 +131,7 @@ def main():
             custom_algo = st.text_area("Custom Algorithm Logic", "If RSI < 30 and Price > EMA 20, Enter Long")
             
             st.subheader("Results: Backtesting Engine")
-            metrics = te.simple_backtest(df_ind, initial_capital, risk_pct)
+            metrics = DATA_SERVICE.backtest(stock_code, timeframe, initial_capital, risk_pct)
             m_col1, m_col2 = st.columns(2)
             m_col1.metric("Win Rate", f"{metrics['win_rate']:.1f}%")
             m_col2.metric("Profit Factor", f"{metrics['profit_factor']:.2f}")
@@ -136,18 +142,69 @@ def main():
             
             # Position Size Calculation
             last_price = df_ind['Close'].iloc[-1]
-            risk_amount = initial_capital * (risk_pct / 100)
-            stop_loss_val = last_price * (stop_loss_pct / 100)
-            pos_size_shares = int(risk_amount // stop_loss_val) if stop_loss_val > 0 else 0
+            sizing = ps.size_positions([stock_code], last_price, initial_capital, risk_pct, stop_pct=stop_loss_pct).iloc[0]
+            risk_amount = sizing["risk_budget"]
+            pos_size_shares = int(sizing["qty"])
             
-            st.info(f"Rekomendasi Position Size: **{pos_size_shares:,} Saham** (Rp {pos_size_shares * last_price:,.0f})")
+            st.info(f"Rekomendasi Position Size: **{pos_size_shares:,} Saham / {int(sizing['lots']):,} Lot** (Rp {sizing['capital_used']:,.0f})")
             st.metric("Risk Amount per Trade", f"Rp {risk_amount:,.0f}")
+
+            st.caption("Sensitivitas Position Size (Lot): Risk % × Stop Loss %")
+            st.dataframe(ps.sensitivity_grid(
+                last_price, initial_capital,
+                risk_pcts=[0.5, 1.0, 1.5, 2.0, 3.0, 5.0],
+                stop_pcts=[1.0, 2.0, 3.0, 5.0, 7.5, 10.0],
+            ))
             
             st.subheader("Fundamental Insights")
-            fund = te.compute_fundamental_dummy(stock_code, selected_sector)
+            fund = DATA_SERVICE.fundamentals(stock_code, selected_sector)
             st.write(f"**P/E Ratio:** {fund['pe']} (Avg Sektor: {fund['sector_pe_avg']})")
             st.write(f"**ROE:** {fund['roe']}% | **EPS:** Rp {fund['eps']}")
 
+        with st.expander("Screener: Position Sizing Semua Emiten (ATR Stop)"):
+            if st.button("Hitung Sizing Universe"):
+                universe = {code: DATA_SERVICE.price_data(code, timeframe) for code in dd.IDX_STOCKS}
+                universe = {code: df for code, df in universe.items() if len(df) > 14}
+                sizes = ps.size_positions(
+                    list(universe),
+                    [df["Close"].iloc[-1] for df in universe.values()],
+                    initial_capital,
+                    risk_pct,
+                    atr=[ps.compute_atr(df).iloc[-1] for df in universe.values()],
+                )
+                totals = ps.portfolio_risk_totals(sizes, initial_capital)
+                if totals["over_allocated"]:
+                    st.warning(
+                        f"Sizing per emiten memakai {totals['capital_used_pct']:.0f}% modal; "
+                        "lot diskalakan proporsional agar muat di modal bersama."
+                    )
+                    sizes = ps.fit_to_capital(sizes, initial_capital)
+                    totals = ps.portfolio_risk_totals(sizes, initial_capital)
+                st.dataframe(sizes[["last_price", "stop_price", "lots", "capital_used", "risk_at_stop"]])
+                st.write(
+                    f"**Total Modal Terpakai:** Rp {totals['capital_used']:,.0f} ({totals['capital_used_pct']:.1f}%) | "
+                    f"**Total Risk:** Rp {totals['total_risk']:,.0f} ({totals['total_risk_pct']:.1f}%)"
+                )
+
+                st.markdown("**Alokasi Portofolio Optimal (PuLP)**")
+                candidates = popt.build_candidates(
+                    {code: DATA_SERVICE.indicators(code, timeframe) for code in universe},
+                    initial_capital, risk_pct, stop_loss_pct,
+                )
+                alloc = popt.DEFAULT_OPTIMIZER.solve(
+                    candidates, initial_capital,
+                    max_risk_pct=risk_pct * 5, sector_cap_pct=40.0, min_win_rate=40.0,
+                    time_limit=5.0,
+                )
+                if alloc is None:
+                    st.warning("PuLP tidak tersedia.")
+                else:
+                    st.dataframe(alloc.allocation[alloc.allocation["lots"] > 0])
+                    st.caption(
+                        f"Status: {alloc.status} | Expected Return: Rp {alloc.expected_return:,.0f} | "
+                        f"Solve: {alloc.solve_seconds * 1000:.0f} ms{' (cache)' if alloc.cached else ''}"
+                    )
+
         st.markdown("---")
         st.subheader("Strategy Optimization (via PuLP)")
         opt = te.optimize_strategy_with_pulp(metrics)
@@ -168,11 +225,42 @@ def main():
             st.subheader("Order Management")
             order_type = st.selectbox("Order Type", ["Limit", "Market", "Trailing Stop", "OCO"])
             order_qty = st.number_input("Quantity (Lots)", value=max(1, pos_size_shares//100))
-            if st.button("Simulasikan Order"):
+            simulate = st.button("Simulasikan Order")
+            if simulate and len(df_ind) < 2:
+                st.warning("Data terlalu pendek untuk simulasi order (minimal 2 bar).")
+            elif simulate:
+                # Order dipasang 20 bar lalu, kemudian direplay ke bar terakhir
+                replay_bars = df_ind.iloc[-20:] if len(df_ind) > 20 else df_ind.iloc[1:]
+                ref_price = float(df_ind["Close"].loc[:replay_bars.index[0]].iloc[-2])
+                qty = int(order_qty) * dd.IDX_LOT_SIZE
+                stop_dist = ref_price * stop_loss_pct / 100
+                sim = osim.OrderSimulator(slippage_ticks=1)
+                if order_type == "Limit":
+                    sim.submit(osim.Order(stock_code, osim.BUY, qty, osim.LIMIT, limit_price=ref_price - stop_dist))
+                else:
+                    sim.submit(osim.Order(stock_code, osim.BUY, qty, osim.MARKET))
+                if order_type == "Trailing Stop":
+                    sim.submit(osim.Order(stock_code, osim.SELL, qty, osim.TRAILING_STOP, trail_amount=stop_dist), ref_price=ref_price)
+                elif order_type == "OCO":
+                    sim.submit_oco(
+                        osim.Order(stock_code, osim.SELL, qty, osim.LIMIT, limit_price=ref_price + 2 * stop_dist, tag="take_profit"),
+                        osim.Order(stock_code, osim.SELL, qty, osim.STOP, stop_price=ref_price - stop_dist, tag="stop_loss"),
+                    )
+                fills = sim.replay({stock_code: replay_bars})
+                intgr.record_broker_signal_dummy("simulator", stock_code, "buy", qty, tags=[order_type])
                 st.toast(f"Order {order_type} for {order_qty} lots of {stock_code} placed (Simulated)")
+
+                if fills:
+                    st.dataframe(osim.fills_frame(fills).drop(columns=["order_id"]))
+                    trades = osim.fills_to_trades(fills)
+                    st.session_state.setdefault("sim_trades", []).extend(trades.to_dict("records"))
+                    sim_metrics = osim.trade_metrics(trades)
+                    st.write(f"**Round-trip:** {int(sim_metrics['total_trades'])} | **Net P/L:** Rp {sim_metrics['net_pnl']:,.0f} | **Open Orders:** {sim.open_orders()}")
+                else:
+                    st.info("Order belum terisi pada 20 bar terakhir.")
             
             st.subheader("Sentiment Analysis")
-            sent = te.compute_sentiment_dummy(stock_code)
+            sent = DATA_SERVICE.sentiment(stock_code)
             st.write(f"News: {sent['positive_news']}% Positive | Hype: {sent['social_hype']}%")
             st.progress(sent['sentiment_score']/100, text=f"Sentiment Score: {sent['sentiment_score']}")
 
@@ -183,6 +271,18 @@ def main():
             if st.button("Set Alert"):
                 st.success(f"Alert set at Rp {price_target:,.0f}")
 
+            if st.button("Replay Streaming (1m)"):
+                feed = intgr.idx_price_stream([stock_code], speedup=None)
+                engine = stream.StreamEngine(feed, alerts=[stream.AlertRule(stock_code, price_target)])
+                stream_stats = asyncio.run(engine.run())
+                for ev in engine.signals[-10:]:
+                    label = ev.signal.upper() if ev.signal else "ALERT"
+                    st.write(f"{ev.bar.ts:%H:%M} {label} @ Rp {ev.bar.close:,.0f} {' '.join(ev.alerts)}")
+                st.caption(
+                    f"{int(stream_stats['bars'])} bar | latency p50 {stream_stats['p50_ms']:.2f} ms, "
+                    f"p99 {stream_stats['p99_ms']:.2f} ms"
+                )
+
     # --- Tab 3: Evaluasi ---
     with tab3:
         st.header("Phase 3: Evaluation (Evaluasi Kinerja)")
@@ -191,11 +291,34 @@ def main():
         with col_ev1:
             st.subheader("Trading Journal Otomatis")
             journal_note = st.text_area("Catatan Trading", f"Eksekusi {stock_code} pada {trade_date}. Alasan: Breakout EMA.")
+            j_col1, j_col2, j_col3 = st.columns(3)
+            j_entry = j_col1.number_input("Harga Entry", value=0.0, step=5.0)
+            j_exit = j_col2.number_input("Harga Exit", value=0.0, step=5.0)
+            j_lots = j_col3.number_input("Lot", value=0, step=1)
+            journal = get_journal_store()
             if st.button("Save Journal"):
-                st.success("Journal saved locally (Dummy)")
+                journal.add_manual(
+                    user_name, stock_code, trade_date, journal_note,
+                    qty=int(j_lots) * dd.IDX_LOT_SIZE,
+                    entry_price=j_entry or None,
+                    exit_price=j_exit or None,
+                )
+                sim_trades = st.session_state.pop("sim_trades", [])
+                n_sim = journal.add_trades(user_name, sim_trades, source="simulated")
+                st.success(f"Journal tersimpan (1 catatan manual + {n_sim} trade simulasi)")
 
             st.subheader("Performance Analytics")
             st.pyplot(fig_m)
+
+            j_sum = journal.summary(user_name)
+            if j_sum["total_trades"] > 0:
+                a1, a2, a3, a4 = st.columns(4)
+                a1.metric("Journal Win Rate", f"{j_sum['win_rate']:.1f}%")
+                a2.metric("Journal Profit Factor", f"{j_sum['profit_factor']:.2f}")
+                a3.metric("Net P/L", f"Rp {j_sum['net_pnl']:,.0f}")
+                a4.metric("Max Drawdown", f"Rp {j_sum['max_drawdown']:,.0f}")
+                st.dataframe(journal.monthly_stats(user_name))
+                st.dataframe(journal.sector_stats(user_name))
         
         with col_ev2:
             st.subheader("Correlation Matrix")
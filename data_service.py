@@ -0,0 +1,287 @@
+"""
+Data service bersama lintas sesi Streamlit (satu proses).
+
+- Single-flight: permintaan identik yang sedang berjalan (mis. 20 trader membuka
+  BBCA bersamaan) digabung; hanya satu fetch/compute dijalankan dan semua
+  penunggu menerima hasil yang sama.
+- Store LRU terbatas dengan TTL per jenis data (harga, indikator, backtest,
+  fundamental, sentimen).
+- Hasil DataFrame/dict dikembalikan sebagai salinan agar sesi tidak saling
+  mengubah objek bersama.
+
+Untuk produksi multi-proses/multi-node:
+- Ganti `TTLStore` dengan Redis dan single-flight dengan lock terdistribusi.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from resampling import OHLCVPyramid
+
+# TTL default (detik) per jenis data
+DEFAULT_TTLS: Dict[str, float] = {
+    "prices": 300.0,
+    "indicators": 300.0,
+    "backtest": 300.0,
+    "fundamentals": 6 * 3600.0,
+    "sentiment": 900.0,
+}
+
+
+class _Call:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Gabungkan panggilan dengan key sama yang sedang berjalan."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return (hasil, shared); `shared=True` jika menumpang panggilan lain."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.value, False
+
+
+class TTLStore:
+    """Cache LRU thread-safe dengan waktu kedaluwarsa per entri."""
+
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] <= self._clock():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, entry[1]
+
+    def put(self, key: Hashable, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _share(value: Any) -> Any:
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+class DataService:
+    """
+    Fasad `trading_engine` dengan cache bersama + single-flight.
+
+    Contoh:
+        df_ind = DATA_SERVICE.indicators("BBCA", "1d")
+        metrics = DATA_SERVICE.backtest("BBCA", "1d", 1e8, 1.0)
+
+    Entri "prices" menyimpan piramida timeframe per (emiten, periode), jadi ganti
+    timeframe cukup lookup cache. `price_loader` (default `get_price_pyramid`)
+    dipanggil dengan `use_cache=False` sehingga TTL "prices" benar-benar memicu
+    fetch ulang dan PYRAMID_CACHE tidak diisi.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttls: Optional[Mapping[str, float]] = None,
+        price_loader: Optional[Callable[..., "OHLCVPyramid"]] = None,
+    ) -> None:
+        self.price_loader = price_loader
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.store = TTLStore(max_entries)
+        self.flight = SingleFlight()
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "hits": 0, "executions": 0, "coalesced": 0}
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _get(self, kind: str, key: Tuple[Any, ...], fn: Callable[[], Any]) -> Any:
+        full_key = (kind,) + key
+        self._count("requests")
+        found, value = self.store.get(full_key)
+        if found:
+            self._count("hits")
+            return _share(value)
+
+        def load() -> Any:
+            # Cek ulang: leader sebelumnya mungkin baru saja mengisi store
+            found, value = self.store.get(full_key)
+            if found:
+                return value
+            self._count("executions")
+            value = fn()
+            self.store.put(full_key, value, self.ttls[kind])
+            return value
+
+        value, shared = self.flight.do(full_key, load)
+        if shared:
+            self._count("coalesced")
+        return _share(value)
+
+    # --- jenis data ------------------------------------------------------
+    def price_pyramid(self, symbol: str, period_days: int = 365) -> "OHLCVPyramid":
+        from trading_engine import get_price_pyramid
+
+        loader = self.price_loader or get_price_pyramid
+        symbol = symbol.strip().upper()
+        # Kesegaran data diatur TTL "prices" di sini, bukan PYRAMID_CACHE
+        return self._get("prices", (symbol, period_days), lambda: loader(symbol, period_days, use_cache=False))
+
+    def price_data(self, symbol: str, timeframe: str, period_days: int = 365) -> pd.DataFrame:
+        return self.price_pyramid(symbol, period_days).get(timeframe).copy()
+
+    def indicators(
+        self, symbol: str, timeframe: str, period_days: int = 365, rsi_period: int = 14, ema_period: int = 20, bb_period: int = 20
+    ) -> pd.DataFrame:
+        from trading_engine import compute_indicators
+
+        symbol = symbol.strip().upper()
+        return self._get(
+            "indicators",
+            (symbol, timeframe, period_days, rsi_period, ema_period, bb_period),
+            lambda: compute_indicators(self.price_data(symbol, timeframe, period_days), rsi_period, ema_period, bb_period),
+        )
+
+    def backtest(self, symbol: str, timeframe: str, initial_capital: float, risk_pct: float, period_days: int = 365) -> Dict[str, float]:
+        from trading_engine import simple_backtest
+
+        symbol = symbol.strip().upper()
+        return self._get(
+            "backtest",
+            (symbol, timeframe, period_days, float(initial_capital), float(risk_pct)),
+            lambda: simple_backtest(self.indicators(symbol, timeframe, period_days), initial_capital, risk_pct),
+        )
+
+    def fundamentals(self, symbol: str, sector: str) -> Dict[str, float]:
+        from trading_engine import compute_fundamental_dummy
+
+        symbol = symbol.strip().upper()
+        return self._get("fundamentals", (symbol, sector), lambda: compute_fundamental_dummy(symbol, sector))
+
+    def sentiment(self, symbol: str) -> Dict[str, float]:
+        from trading_engine import compute_sentiment_dummy
+
+        symbol = symbol.strip().upper()
+        return self._get("sentiment", (symbol,), lambda: compute_sentiment_dummy(symbol))
+
+    def stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            stats = {k: float(v) for k, v in self._stats.items()}
+        stats["entries"] = float(len(self.store))
+        return stats
+
+
+# Instance bersama untuk semua sesi Streamlit dalam proses yang sama.
+DATA_SERVICE = DataService()
+
+
+def benchmark_single_flight(
+    n_sessions: int = 100,
+    symbols: Tuple[str, ...] = ("BBCA", "BBRI", "TLKM", "ASII", "ADRO"),
+    fetch_delay: float = 0.05,
+) -> Dict[str, float]:
+    """
+    Simulasi `n_sessions` sesi yang serentak membuka dashboard (harga, indikator,
+    backtest, fundamental, sentimen) untuk emiten populer. `fetch_delay` meniru
+    latensi fetch data eksternal. Dibandingkan dengan baseline tanpa service.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    import trading_engine as te
+    from resampling import PYRAMID_CACHE
+
+    def slow_fetch(symbol: str, period_days: int = 365, use_cache: bool = False) -> "OHLCVPyramid":
+        time.sleep(fetch_delay)
+        return te.get_price_pyramid(symbol, period_days, use_cache=use_cache)
+
+    rng = np.random.default_rng(0)
+    picks = [symbols[i] for i in rng.integers(0, len(symbols), n_sessions)]
+
+    def session_baseline(symbol: str) -> None:
+        df_ind = te.compute_indicators(slow_fetch(symbol).get("1d").copy())
+        te.simple_backtest(df_ind, 1e8, 1.0)
+        te.compute_fundamental_dummy(symbol, "Banking")
+        te.compute_sentiment_dummy(symbol)
+
+    service = DataService(price_loader=slow_fetch)
+
+    def session_service(symbol: str) -> None:
+        service.indicators(symbol, "1d")
+        service.backtest(symbol, "1d", 1e8, 1.0)
+        service.fundamentals(symbol, "Banking")
+        service.sentiment(symbol)
+
+    results = {}
+    for name, fn in (("baseline", session_baseline), ("service", session_service)):
+        PYRAMID_CACHE.clear()
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n_sessions) as pool:
+            list(pool.map(fn, picks))
+        results[f"{name}_s"] = time.perf_counter() - t0
+
+    stats = service.stats()
+    return {
+        "sessions": float(n_sessions),
+        **results,
+        **stats,
+        "coalesced_pct": stats["coalesced"] / stats["requests"] * 100.0 if stats["requests"] else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark_single_flight())
@@ -27,3 +27,15 @@ COMPLIANCE_NOTES = {
     "IDX": "Mengikuti panduan keterbukaan informasi Bursa Efek Indonesia.",
     "ESG": "Analisa emisi komputasi disertakan dalam laporan evaluasi.",
 }
+
+# Satuan perdagangan BEI: 1 lot = 100 lembar saham.
+IDX_LOT_SIZE = 100
+
+# Fraksi harga (tick size) BEI: (batas harga atas eksklusif, tick Rp).
+IDX_TICK_SIZES = [
+    (200, 1),
+    (500, 2),
+    (2000, 5),
+    (5000, 10),
+    (float("inf"), 25),
+]
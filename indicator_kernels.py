@@ -0,0 +1,305 @@
+"""
+Kernel indikator NumPy multi-periode (tanpa TA-Lib).
+
+Setiap fungsi menerima harga penutupan berbentuk (symbol × time) — atau 1D
+untuk satu emiten, atau DataFrame time × symbol hasil `build_matrix` — dan
+vektor periode, lalu mengembalikan array 3D (period × symbol × time).
+
+- SMA/Bollinger memakai cumsum bersama (satu kali untuk semua periode).
+- Rekursi EMA, RSI Wilder, dan MACD dimulai dari nilai seed SMA lalu dijalankan
+  oleh `ewm(adjust=False)` pandas (kode terkompilasi) untuk semua emiten per
+  periode, jadi tidak ada loop Python sepanjang waktu.
+- Seeding & lookback mengikuti TA-Lib (EMA diseed SMA, RSI Wilder diseed rata-rata
+  `period` selisih pertama, BBANDS stddev populasi, MACD menyelaraskan EMA cepat
+  ke lookback EMA lambat), jadi hasil identik dengan jalur talib di
+  `compute_indicators`. Nilai sebelum lookback = NaN. `verify_against_reference`
+  membandingkan kernel dengan port skalar algoritma TA-Lib.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+CloseLike = Union[np.ndarray, pd.Series, pd.DataFrame, Sequence[float]]
+Periods = Union[int, Sequence[int], np.ndarray]
+
+
+def _as_2d(close: CloseLike) -> np.ndarray:
+    if isinstance(close, pd.DataFrame):
+        arr = close.to_numpy(dtype=np.float64).T
+    else:
+        arr = np.asarray(close, dtype=np.float64)
+    if arr.ndim == 1:
+        arr = arr[None, :]
+    return np.ascontiguousarray(arr)
+
+
+def _as_periods(periods: Periods) -> np.ndarray:
+    p = np.atleast_1d(np.asarray(periods, dtype=np.int64))
+    if (p < 1).any():
+        raise ValueError("Periode harus >= 1.")
+    return p
+
+
+def _window_mean(cs: np.ndarray, end: np.ndarray, length: np.ndarray) -> np.ndarray:
+    """
+    Rata-rata jendela [end-length+1, end] per periode dari cumsum `cs`
+    (shape (..., T+1), cs[..., 0] = 0). Jendela di luar data -> NaN.
+    """
+    T = cs.shape[-1] - 1
+    ok = end < T
+    hi = np.minimum(end + 1, T)
+    lo = np.clip(end + 1 - length, 0, T)
+    if cs.ndim == 2:
+        total = cs[:, hi] - cs[:, lo]  # (S, P)
+        out = (total / length).T
+    else:
+        total = np.take_along_axis(cs, hi[:, None, None], axis=2) - np.take_along_axis(cs, lo[:, None, None], axis=2)
+        out = total[:, :, 0] / length[:, None]
+    out[~ok] = np.nan
+    return out
+
+
+def _recursive(x: np.ndarray, alpha: np.ndarray, seed_idx: np.ndarray, seed_val: np.ndarray) -> np.ndarray:
+    """
+    y[t] = y[t-1] + alpha × (x[t] - y[t-1]), dengan y[seed_idx] = seed_val dan
+    NaN sebelumnya. `x` (S, T) dipakai semua periode, atau (P, S, T) per periode.
+    Ekor mulai seed dijalankan `ewm(adjust=False)` sekaligus untuk semua emiten.
+    """
+    P = alpha.shape[0]
+    S, T = x.shape[-2], x.shape[-1]
+    out = np.full((P, S, T), np.nan)
+    for i in range(P):
+        start = int(seed_idx[i])
+        if start >= T:
+            continue
+        tail = (x[i] if x.ndim == 3 else x)[:, start:].T.copy()
+        tail[0] = seed_val[i]
+        smoothed = pd.DataFrame(tail).ewm(alpha=float(alpha[i]), adjust=False).mean()
+        out[i, :, start:] = smoothed.to_numpy().T
+    return out
+
+
+def ema_multi(close: CloseLike, periods: Periods) -> np.ndarray:
+    """EMA (k = 2/(n+1)), seed SMA `n` bar pertama; output mulai indeks n-1."""
+    x = _as_2d(close)
+    p = _as_periods(periods)
+    cs = np.concatenate([np.zeros((x.shape[0], 1)), np.cumsum(x, axis=1)], axis=1)
+    seed_idx = p - 1
+    return _recursive(x, 2.0 / (p + 1.0), seed_idx, _window_mean(cs, seed_idx, p))
+
+
+def rsi_multi(close: CloseLike, periods: Periods) -> np.ndarray:
+    """RSI smoothing Wilder; seed rata-rata `n` selisih pertama, output mulai indeks n."""
+    x = _as_2d(close)
+    p = _as_periods(periods)
+    diff = np.diff(x, axis=1, prepend=x[:, :1])
+    gain, loss = np.maximum(diff, 0.0), np.maximum(-diff, 0.0)
+    zeros = np.zeros((x.shape[0], 1))
+    cg = np.concatenate([zeros, np.cumsum(gain, axis=1)], axis=1)
+    cl = np.concatenate([zeros, np.cumsum(loss, axis=1)], axis=1)
+    alpha = 1.0 / p
+    avg_gain = _recursive(gain, alpha, p, _window_mean(cg, p, p))
+    avg_loss = _recursive(loss, alpha, p, _window_mean(cl, p, p))
+    total = avg_gain + avg_loss
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = np.where(total > 0, 100.0 * avg_gain / total, 0.0)
+    rsi[np.isnan(total)] = np.nan
+    return rsi
+
+
+def bollinger_multi(close: CloseLike, periods: Periods, nbdev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(upper, middle, lower) dengan SMA & stddev populasi; output mulai indeks n-1."""
+    x = _as_2d(close)
+    p = _as_periods(periods)
+    S, T = x.shape
+    # Dipusatkan ke harga pertama agar sum kuadrat tidak kehilangan presisi
+    offset = x[:, :1]
+    xc = x - offset
+    zeros = np.zeros((S, 1))
+    cs = np.concatenate([zeros, np.cumsum(xc, axis=1)], axis=1)
+    cs2 = np.concatenate([zeros, np.cumsum(xc * xc, axis=1)], axis=1)
+
+    mean = np.full((p.shape[0], S, T), np.nan)
+    var = np.full((p.shape[0], S, T), np.nan)
+    for i, n in enumerate(p):
+        if n > T:
+            continue
+        s1 = cs[:, n:] - cs[:, :-n]
+        s2 = cs2[:, n:] - cs2[:, :-n]
+        m = s1 / n
+        mean[i, :, n - 1:] = m
+        var[i, :, n - 1:] = np.maximum(s2 / n - m * m, 0.0)
+    middle = mean + offset[None]
+    dev = nbdev * np.sqrt(var)
+    return middle + dev, middle, middle - dev
+
+
+def macd_multi(
+    close: CloseLike,
+    fast: Periods = 12,
+    slow: Periods = 26,
+    signal: Periods = 9,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (macd, signal, hist) untuk tiap kombinasi (fast[i], slow[i], signal[i])
+    (skalar di-broadcast). Seperti TA-Lib, EMA cepat diseed pada indeks
+    slow-1 dengan SMA `fast` bar terakhir; output mulai indeks slow+signal-2.
+    """
+    x = _as_2d(close)
+    f, s, g = np.broadcast_arrays(_as_periods(fast), _as_periods(slow), _as_periods(signal))
+    f, s = np.minimum(f, s), np.maximum(f, s)
+    cs = np.concatenate([np.zeros((x.shape[0], 1)), np.cumsum(x, axis=1)], axis=1)
+    seed_idx = s - 1
+
+    ema_fast = _recursive(x, 2.0 / (f + 1.0), seed_idx, _window_mean(cs, seed_idx, f))
+    ema_slow = _recursive(x, 2.0 / (s + 1.0), seed_idx, _window_mean(cs, seed_idx, s))
+    macd = ema_fast - ema_slow
+
+    cm = np.concatenate([np.zeros(macd.shape[:2] + (1,)), np.cumsum(np.nan_to_num(macd), axis=2)], axis=2)
+    sig_idx = seed_idx + g - 1
+    sig = _recursive(macd, 2.0 / (g + 1.0), sig_idx, _window_mean(cm, sig_idx, g))
+    macd[np.isnan(sig)] = np.nan
+    return macd, sig, macd - sig
+
+
+def indicator_set(
+    close: CloseLike,
+    rsi_periods: Periods = 14,
+    ema_periods: Periods = 20,
+    bb_periods: Periods = 20,
+) -> Dict[str, np.ndarray]:
+    """Semua indikator `compute_indicators` untuk grid periode, masing-masing (period × symbol × time)."""
+    x = _as_2d(close)
+    upper, middle, lower = bollinger_multi(x, bb_periods)
+    macd, macd_signal, _ = macd_multi(x)
+    return {
+        "RSI": rsi_multi(x, rsi_periods),
+        "EMA": ema_multi(x, ema_periods),
+        "BB_upper": upper,
+        "BB_middle": middle,
+        "BB_lower": lower,
+        "MACD": macd,
+        "MACD_signal": macd_signal,
+    }
+
+
+# --- referensi skalar (port langsung algoritma TA-Lib) -------------------------
+def _ref_ema(x: Sequence[float], n: int, start: Optional[int] = None) -> List[float]:
+    """TA_INT_EMA: seed SMA `n` nilai yang berakhir di `start` (default n-1)."""
+    start = n - 1 if start is None else max(start, n - 1)
+    out = [math.nan] * len(x)
+    if start >= len(x):
+        return out
+    k = 2.0 / (n + 1)
+    prev = sum(x[start - n + 1:start + 1]) / n
+    out[start] = prev
+    for t in range(start + 1, len(x)):
+        prev = (x[t] - prev) * k + prev
+        out[t] = prev
+    return out
+
+
+def _ref_rsi(x: Sequence[float], n: int) -> List[float]:
+    out = [math.nan] * len(x)
+    if len(x) <= n:
+        return out
+    gain = sum(max(x[t] - x[t - 1], 0.0) for t in range(1, n + 1)) / n
+    loss = sum(max(x[t - 1] - x[t], 0.0) for t in range(1, n + 1)) / n
+    out[n] = 100.0 * gain / (gain + loss) if gain + loss else 0.0
+    for t in range(n + 1, len(x)):
+        d = x[t] - x[t - 1]
+        gain = (gain * (n - 1) + max(d, 0.0)) / n
+        loss = (loss * (n - 1) + max(-d, 0.0)) / n
+        out[t] = 100.0 * gain / (gain + loss) if gain + loss else 0.0
+    return out
+
+
+def _ref_bbands_middle(x: Sequence[float], n: int) -> List[float]:
+    return [math.nan] * (n - 1) + [sum(x[t - n + 1:t + 1]) / n for t in range(n - 1, len(x))]
+
+
+def _ref_macd(x: Sequence[float], fast: int, slow: int, signal: int) -> Tuple[List[float], List[float]]:
+    fast, slow = min(fast, slow), max(fast, slow)
+    start = slow - 1
+    line = [f - s for f, s in zip(_ref_ema(x, fast, start), _ref_ema(x, slow, start))]
+    sig = [math.nan] * start + _ref_ema(line[start:], signal)
+    return [m if not math.isnan(s) else math.nan for m, s in zip(line, sig)], sig
+
+
+def verify_against_reference(n_symbols: int = 3, n_bars: int = 300, seed: int = 1) -> Dict[str, float]:
+    """
+    Bandingkan kernel dengan port skalar TA-Lib pada random walk (termasuk
+    rentang harga datar). Return selisih absolut maksimum per indikator;
+    posisi NaN (lookback) harus identik, jika tidak `AssertionError`.
+    """
+    rng = np.random.default_rng(seed)
+    close = 1000.0 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_symbols, n_bars)), axis=1))
+    close[:, n_bars // 4: n_bars // 4 + 20] = close[:, n_bars // 4: n_bars // 4 + 1]
+    periods = [2, 5, 14, 30]
+    macd_params = [(12, 26, 9), (5, 35, 5), (3, 10, 3)]
+
+    kernels = {
+        "EMA": (ema_multi(close, periods), lambda x, n: _ref_ema(x, n)),
+        "RSI": (rsi_multi(close, periods), _ref_rsi),
+        "BB_middle": (bollinger_multi(close, periods)[1], _ref_bbands_middle),
+    }
+    macd, macd_sig, _ = macd_multi(close, *(list(col) for col in zip(*macd_params)))
+    errors = {name: 0.0 for name in (*kernels, "MACD", "MACD_signal")}
+
+    def compare(name: str, got: np.ndarray, want: Sequence[float]) -> None:
+        want_arr = np.asarray(want, dtype=np.float64)
+        assert (np.isnan(got) == np.isnan(want_arr)).all(), f"Lookback {name} tidak sama dengan TA-Lib"
+        if np.isfinite(want_arr).any():
+            errors[name] = max(errors[name], float(np.nanmax(np.abs(got - want_arr))))
+
+    for s_i in range(n_symbols):
+        x = close[s_i].tolist()
+        for name, (arr, ref) in kernels.items():
+            for p_i, n in enumerate(periods):
+                compare(name, arr[p_i, s_i], ref(x, n))
+        for c_i, params in enumerate(macd_params):
+            want_line, want_sig = _ref_macd(x, *params)
+            compare("MACD", macd[c_i, s_i], want_line)
+            compare("MACD_signal", macd_sig[c_i, s_i], want_sig)
+    return errors
+
+
+def benchmark_kernels(n_symbols: int = 200, n_bars: int = 1000, periods: Sequence[int] = tuple(range(5, 55, 5))) -> Dict[str, float]:
+    """Satu pass multi-periode vs loop pandas per periode (RSI Wilder + EMA + Bollinger)."""
+    rng = np.random.default_rng(0)
+    close = 1000.0 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_symbols, n_bars)), axis=1))
+
+    t0 = time.perf_counter()
+    rsi_multi(close, periods)
+    ema_multi(close, periods)
+    bollinger_multi(close, periods)
+    kernel_s = time.perf_counter() - t0
+
+    frame = pd.DataFrame(close.T)
+    t0 = time.perf_counter()
+    delta = frame.diff()
+    for n in periods:
+        delta.clip(lower=0).ewm(alpha=1.0 / n, adjust=False).mean()
+        (-delta).clip(lower=0).ewm(alpha=1.0 / n, adjust=False).mean()
+        frame.ewm(span=n, adjust=False).mean()
+        frame.rolling(n).mean()
+        frame.rolling(n).std(ddof=0)
+    pandas_s = time.perf_counter() - t0
+    return {
+        "symbols": float(n_symbols),
+        "bars": float(n_bars),
+        "periods": float(len(periods)),
+        "kernel_s": kernel_s,
+        "pandas_loop_s": pandas_s,
+    }
+
+
+if __name__ == "__main__":
+    print(verify_against_reference())
+    print(benchmark_kernels())
@@ -11,7 +11,7 @@ fungsi-fungsi di sini dapat diisi dengan implementasi nyata dan autentikasi yang
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 
 def simulate_email_alert(to_address: str, subject: str, body: str) -> Dict[str, Any]:
@@ -69,10 +69,30 @@ def dummy_idx_price_feed(symbol: str) -> Dict[str, Any]:
     return {
         "source": "idx_dummy",
         "symbol": symbol.upper(),
-        "note": "Data real-time belum diaktifkan; gunakan yfinance/random walk di sisi analitik.",
+        "note": "Data real-time belum diaktifkan; gunakan `idx_price_stream` (mode replay) untuk simulasi streaming.",
     }
 
 
+def idx_price_stream(
+    symbols: List[str],
+    mode: str = "replay",
+    n_bars: int = 390,
+    speedup: Optional[float] = 60.0,
+    store: Any = None,
+) -> Any:
+    """
+    Sumber feed asyncio (`streaming.FeedSource`) untuk `streaming.StreamEngine`.
+
+    - mode "replay": bar 1m dari `OHLCVStore` (jika `store` diberikan) atau sintetis.
+    - mode "live"  : `CallbackSource`; adapter broker/vendor memanggil `push(bar)`.
+    """
+    from streaming import CallbackSource, ReplaySource
+
+    if mode == "live":
+        return CallbackSource()
+    return ReplaySource.from_symbols(symbols, n_bars=n_bars, store=store, speedup=speedup)
+
+
 def dummy_news_sentiment(symbol: str) -> Dict[str, Any]:
     """
     Dummy agregator sentimen berita CNBC/Investing/sosial media.
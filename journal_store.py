@@ -0,0 +1,388 @@
+"""
+Store trading journal lokal berbasis SQLite (mode WAL).
+
+Skema:
+- `journal`      : satu baris per trade (simulasi dari `order_simulator` atau manual),
+                   di-index pada (user_hash, symbol, trade_date).
+- `journal_agg`  : agregat harian per (user_hash, dimensi, key, trade_date) untuk
+                   dimensi emiten, sektor, dan total user; di-upsert dalam transaksi
+                   yang sama dengan insert. Query analitik (win rate, profit factor,
+                   drawdown per bulan/sektor) hanya membaca tabel ini berurutan
+                   primary key, sehingga tetap cepat walau `journal` berisi jutaan baris.
+
+User disimpan sebagai hash pendek (sama dengan `usage_logging`), bukan nama asli.
+Mode WAL memungkinkan banyak sesi Streamlit membaca bersamaan selagi satu
+penulis melakukan insert; koneksi dibuat per thread.
+
+Untuk produksi:
+- Pindahkan ke database server (PostgreSQL) bila butuh multi-instance.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from dummy_data import IDX_STOCKS
+from usage_logging import _anonymize_user
+
+DEFAULT_PATH = os.path.join("logs", "journal.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    id INTEGER PRIMARY KEY,
+    user_hash TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    sector TEXT NOT NULL,
+    trade_date TEXT NOT NULL,
+    source TEXT NOT NULL,
+    qty INTEGER NOT NULL DEFAULT 0,
+    entry_price REAL,
+    exit_price REAL,
+    pnl REAL NOT NULL DEFAULT 0,
+    note TEXT NOT NULL DEFAULT '',
+    created_utc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_journal_user_symbol_date ON journal (user_hash, symbol, trade_date);
+CREATE INDEX IF NOT EXISTS ix_journal_user_date ON journal (user_hash, trade_date);
+
+CREATE TABLE IF NOT EXISTS journal_agg (
+    user_hash TEXT NOT NULL,
+    dim TEXT NOT NULL,
+    key TEXT NOT NULL,
+    trade_date TEXT NOT NULL,
+    trades INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    gross_win REAL NOT NULL,
+    gross_loss REAL NOT NULL,
+    pnl REAL NOT NULL,
+    PRIMARY KEY (user_hash, dim, key, trade_date)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_AGG = """
+INSERT INTO journal_agg
+    (user_hash, dim, key, trade_date, trades, wins, gross_win, gross_loss, pnl)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (user_hash, dim, key, trade_date) DO UPDATE SET
+    trades = trades + excluded.trades,
+    wins = wins + excluded.wins,
+    gross_win = gross_win + excluded.gross_win,
+    gross_loss = gross_loss + excluded.gross_loss,
+    pnl = pnl + excluded.pnl
+"""
+
+# Dimensi agregat harian yang dirawat saat insert.
+_AGG_DIMS = ("symbol", "sector", "all")
+_STAT_COLS = ["total_trades", "win_rate", "profit_factor", "net_pnl", "max_drawdown"]
+
+DateLike = Union[str, _dt.date, _dt.datetime, pd.Timestamp]
+
+
+def _date_str(value: DateLike) -> str:
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def _sector(symbol: str) -> str:
+    return IDX_STOCKS.get(symbol, {}).get("sector", "Other")
+
+
+class JournalStore:
+    """
+    Contoh:
+        store = JournalStore()
+        store.add_trades("Ary", osim.fills_to_trades(fills), source="simulated")
+        store.summary("Ary")
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --- write -----------------------------------------------------------
+    def add_trades(
+        self,
+        user_name: str,
+        trades: Union[pd.DataFrame, Iterable[Mapping[str, Any]]],
+        source: str = "simulated",
+    ) -> int:
+        """
+        Insert batch trade dalam satu transaksi. Kolom yang dikenali: symbol,
+        trade_date (atau exit_ts), qty, entry_price, exit_price, pnl, note.
+        Return jumlah baris yang ditulis.
+        """
+        df = trades if isinstance(trades, pd.DataFrame) else pd.DataFrame(list(trades))
+        if df.empty:
+            return 0
+        user_hash = _anonymize_user(user_name)
+        symbol = df["symbol"].astype(str).str.strip().str.upper().str.removesuffix(".JK")
+        date_col = df["trade_date"] if "trade_date" in df.columns else df["exit_ts"]
+        rows = pd.DataFrame({
+            "user_hash": user_hash,
+            "symbol": symbol,
+            "sector": symbol.map(_sector),
+            "trade_date": pd.to_datetime(date_col).dt.strftime("%Y-%m-%d"),
+            "source": source,
+            "qty": df.get("qty", pd.Series(0, index=df.index)).fillna(0).astype(np.int64),
+            "entry_price": df.get("entry_price", pd.Series(np.nan, index=df.index)).astype(float),
+            "exit_price": df.get("exit_price", pd.Series(np.nan, index=df.index)).astype(float),
+            "pnl": df.get("pnl", pd.Series(0.0, index=df.index)).fillna(0.0).astype(float),
+            "note": df.get("note", pd.Series("", index=df.index)).fillna("").astype(str),
+            "created_utc": _dt.datetime.utcnow().isoformat(),
+        })
+
+        # Catatan tanpa hasil trade (tanpa harga exit & P/L) tidak ikut statistik
+        scored = rows[rows["exit_price"].notna() | (rows["pnl"] != 0)]
+        pnl = scored["pnl"]
+        scored = scored.assign(
+            all="all",
+            trades=1,
+            wins=(pnl > 0).astype(np.int64),
+            gross_win=pnl.where(pnl > 0, 0.0),
+            gross_loss=(-pnl).where(pnl <= 0, 0.0),
+        )
+        agg = pd.concat(
+            [
+                scored.groupby([dim, "trade_date"], as_index=False)[
+                    ["trades", "wins", "gross_win", "gross_loss", "pnl"]
+                ].sum().rename(columns={dim: "key"}).assign(user_hash=user_hash, dim=dim)
+                for dim in _AGG_DIMS
+            ],
+            ignore_index=True,
+        )[["user_hash", "dim", "key", "trade_date", "trades", "wins", "gross_win", "gross_loss", "pnl"]]
+
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT INTO journal (user_hash, symbol, sector, trade_date, source, qty, "
+                "entry_price, exit_price, pnl, note, created_utc) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None),
+            )
+            if not agg.empty:
+                conn.executemany(_UPSERT_AGG, agg.astype(object).itertuples(index=False, name=None))
+        return len(rows)
+
+    def add_manual(
+        self,
+        user_name: str,
+        symbol: str,
+        trade_date: DateLike,
+        note: str,
+        qty: int = 0,
+        entry_price: Optional[float] = None,
+        exit_price: Optional[float] = None,
+    ) -> int:
+        """Simpan satu catatan journal manual (P/L dihitung jika harga lengkap)."""
+        pnl = (exit_price - entry_price) * qty if entry_price and exit_price and qty else 0.0
+        return self.add_trades(
+            user_name,
+            [{
+                "symbol": symbol,
+                "trade_date": _date_str(trade_date),
+                "qty": qty,
+                "entry_price": entry_price,
+                "exit_price": exit_price,
+                "pnl": pnl,
+                "note": note,
+            }],
+            source="manual",
+        )
+
+    # --- read ------------------------------------------------------------
+    @staticmethod
+    def _where(
+        user_name: str,
+        dim: str,
+        key: Optional[str] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+    ) -> Tuple[str, List[Any]]:
+        clause, params = "user_hash = ? AND dim = ?", [_anonymize_user(user_name), dim]
+        if key is not None:
+            clause += " AND key = ?"
+            params.append(key)
+        if start is not None:
+            clause += " AND trade_date >= ?"
+            params.append(_date_str(start))
+        if end is not None:
+            clause += " AND trade_date <= ?"
+            params.append(_date_str(end))
+        return clause, params
+
+    @staticmethod
+    def _symbol_filter(symbol: Optional[str]) -> Tuple[str, Optional[str]]:
+        if symbol:
+            return "symbol", symbol.strip().upper().removesuffix(".JK")
+        return "all", "all"
+
+    def _stats_by_key(self, where: str, params: List[Any]) -> pd.DataFrame:
+        """
+        Agregat per key dihitung SQLite (scan berurutan primary key, tanpa sort),
+        drawdown dari deret P/L harian per key dihitung NumPy.
+        """
+        conn = self._conn()
+        groups = conn.execute(
+            "SELECT key, COUNT(*), SUM(trades), SUM(wins), SUM(gross_win), SUM(gross_loss), SUM(pnl) "
+            f"FROM journal_agg WHERE {where} GROUP BY key ORDER BY key",
+            params,
+        ).fetchall()
+        if not groups:
+            return pd.DataFrame(columns=_STAT_COLS, index=pd.Index([], name="key"))
+        pnl = np.fromiter(
+            (r[0] for r in conn.execute(f"SELECT pnl FROM journal_agg WHERE {where} ORDER BY key, trade_date", params)),
+            dtype=np.float64,
+        )
+        counts = np.array([g[1] for g in groups], dtype=np.int64)
+        sums = np.array([g[2:] for g in groups], dtype=np.float64)
+        return _stats_frame([g[0] for g in groups], sums, pnl, np.r_[0, np.cumsum(counts)])
+
+    def summary(
+        self,
+        user_name: str,
+        symbol: Optional[str] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+    ) -> Dict[str, float]:
+        """Win rate, profit factor, total P/L dan max drawdown (Rp) untuk filter tertentu."""
+        dim, key = self._symbol_filter(symbol)
+        out = self._stats_by_key(*self._where(user_name, dim, key, start, end))
+        if out.empty:
+            return {"total_trades": 0.0, "win_rate": 0.0, "profit_factor": 1.0, "net_pnl": 0.0, "max_drawdown": 0.0}
+        return {k: float(v) for k, v in out.iloc[0].items()}
+
+    def monthly_stats(self, user_name: str, symbol: Optional[str] = None) -> pd.DataFrame:
+        """Statistik per bulan (YYYY-MM)."""
+        where, params = self._where(user_name, *self._symbol_filter(symbol))
+        rows = self._conn().execute(
+            "SELECT trade_date, trades, wins, gross_win, gross_loss, pnl "
+            f"FROM journal_agg WHERE {where} ORDER BY trade_date",
+            params,
+        ).fetchall()
+        if not rows:
+            return pd.DataFrame(columns=_STAT_COLS, index=pd.Index([], name="month"))
+        months = [r[0][:7] for r in rows]
+        values = np.array([r[1:] for r in rows], dtype=np.float64)
+        starts = np.flatnonzero([True] + [a != b for a, b in zip(months[1:], months[:-1])])
+        sums = np.add.reduceat(values, starts, axis=0)
+        bounds = np.r_[starts, len(rows)]
+        return _stats_frame([months[i] for i in starts], sums, values[:, 4], bounds).rename_axis("month")
+
+    def sector_stats(self, user_name: str) -> pd.DataFrame:
+        """Statistik per sektor emiten."""
+        return self._stats_by_key(*self._where(user_name, "sector")).rename_axis("sector")
+
+    def entries(self, user_name: str, symbol: Optional[str] = None, limit: int = 50) -> pd.DataFrame:
+        """Baris journal terbaru (memakai index (user_hash, symbol, trade_date))."""
+        sql = (
+            "SELECT trade_date, symbol, source, qty, entry_price, exit_price, pnl, note "
+            "FROM journal WHERE user_hash = ?"
+        )
+        params: List[Any] = [_anonymize_user(user_name)]
+        if symbol:
+            sql += " AND symbol = ?"
+            params.append(symbol.strip().upper().removesuffix(".JK"))
+        sql += " ORDER BY trade_date DESC, id DESC LIMIT ?"
+        return pd.read_sql_query(sql, self._conn(), params=params + [limit])
+
+
+_DEFAULT_STORE: Optional[JournalStore] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_journal_store() -> JournalStore:
+    """Instance store bersama untuk seluruh sesi Streamlit dalam satu proses."""
+    global _DEFAULT_STORE
+    with _DEFAULT_LOCK:
+        if _DEFAULT_STORE is None:
+            _DEFAULT_STORE = JournalStore(DEFAULT_PATH)
+        return _DEFAULT_STORE
+
+
+def _stats_frame(keys: List[str], sums: np.ndarray, pnl: np.ndarray, bounds: np.ndarray) -> pd.DataFrame:
+    """
+    Susun tabel statistik dari jumlah per grup (`sums` kolom: trades, wins,
+    gross_win, gross_loss, pnl) dan deret P/L harian `pnl[bounds[i]:bounds[i+1]]`.
+    """
+    trades, wins, gross_win, gross_loss, net = sums.T
+    profit_factor = np.where(
+        gross_loss > 0,
+        np.divide(gross_win, gross_loss, out=np.zeros_like(gross_win), where=gross_loss > 0),
+        np.where(gross_win > 0, gross_win, 1.0),
+    )
+    return pd.DataFrame(
+        {
+            "total_trades": trades,
+            "win_rate": np.divide(wins * 100, trades, out=np.zeros_like(wins), where=trades > 0),
+            "profit_factor": profit_factor,
+            "net_pnl": net,
+            "max_drawdown": [_max_drawdown(pnl[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])],
+        },
+        index=pd.Index(keys, name="key"),
+    )
+
+
+def _max_drawdown(pnl: np.ndarray) -> float:
+    """Drawdown maksimum (Rp) dari deret P/L berurutan waktu."""
+    if pnl.size == 0:
+        return 0.0
+    equity = np.cumsum(pnl)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0))
+    return float((peak - equity).max())
+
+
+def benchmark_journal(path: str, n_rows: int = 1_000_000, batch: int = 50_000) -> Dict[str, float]:
+    """Isi `n_rows` trade dummy untuk satu user lalu ukur latensi query analitik (ms)."""
+    rng = np.random.default_rng(5)
+    store = JournalStore(path)
+    symbols = np.array(list(IDX_STOCKS))
+    dates = pd.bdate_range("2018-01-01", periods=2000).strftime("%Y-%m-%d").to_numpy()
+
+    t0 = time.perf_counter()
+    for lo in range(0, n_rows, batch):
+        n = min(batch, n_rows - lo)
+        store.add_trades("bench_user", pd.DataFrame({
+            "symbol": symbols[rng.integers(len(symbols), size=n)],
+            "trade_date": np.sort(dates[rng.integers(len(dates), size=n)]),
+            "qty": 100 * rng.integers(1, 50, size=n),
+            "pnl": rng.normal(1000, 50_000, size=n),
+        }))
+    insert_s = time.perf_counter() - t0
+
+    timings: Dict[str, float] = {"rows": float(n_rows), "insert_rows_per_sec": n_rows / insert_s}
+    for name, fn in {
+        "summary_ms": lambda: store.summary("bench_user"),
+        "summary_symbol_ms": lambda: store.summary("bench_user", symbol="BBCA", start="2019-01-01"),
+        "monthly_ms": lambda: store.monthly_stats("bench_user"),
+        "sector_ms": lambda: store.sector_stats("bench_user"),
+    }.items():
+        t0 = time.perf_counter()
+        fn()
+        timings[name] = (time.perf_counter() - t0) * 1e3
+    return timings
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(benchmark_journal(os.path.join(tmp, "journal.db")))
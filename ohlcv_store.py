@@ -0,0 +1,302 @@
+"""
+Store OHLCV on-disk berbasis `numpy.memmap` untuk data 1m multi-tahun.
+
+Layout biner tetap per emiten (satu folder per simbol, satu file per kolom):
+- `ts.i8`     : int64, timestamp epoch nanodetik (UTC-naive, sama dengan datetime64[ns]).
+- `open.f4`, `high.f4`, `low.f4`, `close.f4` : float32.
+- `volume.i8` : int64.
+- `index.json` di root store: jumlah baris & rentang timestamp per simbol.
+
+Dibanding DataFrame float64 + DatetimeIndex, satu bar hanya memakan 32 byte
+dan dibaca sebagai slice zero-copy (OS page cache), sehingga ratusan emiten
+× bertahun-tahun data 1m tidak perlu dimuat ke RAM.
+
+Untuk produksi:
+- Jalankan penulisan (ingest) dari satu proses saja; pembaca boleh banyak.
+- Simpan store di disk lokal (SSD) agar page cache efektif.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+COLUMNS: Dict[str, np.dtype] = {
+    "ts": np.dtype("<i8"),
+    "open": np.dtype("<f4"),
+    "high": np.dtype("<f4"),
+    "low": np.dtype("<f4"),
+    "close": np.dtype("<f4"),
+    "volume": np.dtype("<i8"),
+}
+BYTES_PER_BAR = sum(dt.itemsize for dt in COLUMNS.values())
+
+_EXT = {"<i8": "i8", "<f4": "f4"}
+
+TimeLike = Union[str, int, datetime.datetime, pd.Timestamp]
+
+
+def _to_ns(value: TimeLike) -> int:
+    """Konversi str/datetime/Timestamp/int ke epoch nanodetik."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).value)
+
+
+@dataclass(frozen=True)
+class OHLCVSlice:
+    """
+    Potongan zero-copy satu emiten; setiap atribut adalah view `np.memmap`.
+    """
+
+    symbol: str
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.ts.shape[0])
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def nbytes(self) -> int:
+        return len(self) * BYTES_PER_BAR
+
+    def slice_rows(self, start: int, stop: Optional[int] = None) -> "OHLCVSlice":
+        """Sub-slice posisi baris [start, stop) tanpa menyalin data."""
+        return OHLCVSlice(
+            symbol=self.symbol,
+            **{col: getattr(self, col)[start:stop] for col in ("ts", "open", "high", "low", "close", "volume")},
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialisasi ke DataFrame berkolom kapital (format `get_price_data`)."""
+        return pd.DataFrame(
+            {
+                "Open": np.asarray(self.open),
+                "High": np.asarray(self.high),
+                "Low": np.asarray(self.low),
+                "Close": np.asarray(self.close),
+                "Volume": np.asarray(self.volume),
+            },
+            index=pd.DatetimeIndex(np.asarray(self.ts).view("datetime64[ns]")),
+        )
+
+
+class OHLCVStore:
+    """
+    Store kolom per emiten dengan index JSON kecil.
+
+    Contoh:
+        store = OHLCVStore("data/ohlcv_1m")
+        store.write("BBCA", df_1m)
+        sl = store.read_range("BBCA", "2025-01-01", "2025-03-31")
+        df_ind = te.compute_indicators(sl)
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._index: Dict[str, Dict[str, int]] = self._load_index()
+
+    # --- index -----------------------------------------------------------
+    def _index_path(self) -> str:
+        return os.path.join(self.root, self.INDEX_FILE)
+
+    def _load_index(self) -> Dict[str, Dict[str, int]]:
+        path = self._index_path()
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_index(self) -> None:
+        tmp = self._index_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp, self._index_path())
+
+    def refresh(self) -> None:
+        """Baca ulang index (mis. setelah proses ingest lain menulis)."""
+        self._index = self._load_index()
+
+    def symbols(self) -> List[str]:
+        return sorted(self._index)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.strip().upper() in self._index
+
+    def info(self, symbol: str) -> Dict[str, int]:
+        return dict(self._index[symbol.strip().upper()])
+
+    # --- write -----------------------------------------------------------
+    def _col_path(self, symbol: str, col: str) -> str:
+        return os.path.join(self.root, symbol, f"{col}.{_EXT[COLUMNS[col].str]}")
+
+    @staticmethod
+    def _frame_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("DataFrame OHLCV harus ber-index DatetimeIndex.")
+        cols = {c.lower(): c for c in df.columns}
+        missing = [c for c in ("open", "high", "low", "close", "volume") if c not in cols]
+        if missing:
+            raise ValueError(f"Kolom OHLCV tidak lengkap: {missing}")
+        index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+        out = {"ts": index.as_unit("ns").asi8.astype(COLUMNS["ts"])}
+        for col in ("open", "high", "low", "close", "volume"):
+            out[col] = df[cols[col]].to_numpy().astype(COLUMNS[col])
+        return out
+
+    def write(self, symbol: str, df: pd.DataFrame) -> None:
+        """Tulis ulang seluruh data satu emiten (index harus terurut naik)."""
+        symbol = symbol.strip().upper()
+        data = self._frame_columns(df.sort_index())
+        os.makedirs(os.path.join(self.root, symbol), exist_ok=True)
+        for col, arr in data.items():
+            arr.tofile(self._col_path(symbol, col))
+        self._index[symbol] = {"rows": 0, "first_ts": 0, "last_ts": 0}
+        self._update_index(symbol, data["ts"])
+
+    def append(self, symbol: str, df: pd.DataFrame) -> int:
+        """
+        Tambahkan bar baru di akhir file; bar dengan timestamp <= bar terakhir
+        diabaikan agar file tetap terurut. Return jumlah bar yang ditulis.
+        """
+        symbol = symbol.strip().upper()
+        if symbol not in self._index:
+            self.write(symbol, df)
+            return len(df)
+        data = self._frame_columns(df.sort_index())
+        keep = data["ts"] > self._index[symbol]["last_ts"]
+        if not keep.any():
+            return 0
+        rows = self._index[symbol]["rows"]
+        for col, arr in data.items():
+            # Potong sisa tulisan parsial (mis. crash di tengah append sebelumnya)
+            # agar baris ke-N tetap sejajar di semua kolom.
+            with open(self._col_path(symbol, col), "r+b") as f:
+                f.truncate(rows * arr.itemsize)
+                f.seek(0, os.SEEK_END)
+                arr[keep].tofile(f)
+        self._update_index(symbol, data["ts"][keep])
+        return int(keep.sum())
+
+    def _update_index(self, symbol: str, new_ts: np.ndarray) -> None:
+        entry = self._index[symbol]
+        if len(new_ts):
+            if entry["rows"] == 0:
+                entry["first_ts"] = int(new_ts[0])
+            entry["rows"] += int(len(new_ts))
+            entry["last_ts"] = int(new_ts[-1])
+        self._save_index()
+
+    # --- read ------------------------------------------------------------
+    def _memmap(self, symbol: str, col: str, rows: int) -> np.ndarray:
+        return np.memmap(self._col_path(symbol, col), dtype=COLUMNS[col], mode="r", shape=(rows,))
+
+    def read_range(
+        self,
+        symbol: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+    ) -> OHLCVSlice:
+        """
+        Slice zero-copy untuk rentang [start, end] (inklusif). Lokasi slice
+        dicari dengan binary search pada kolom `ts`, jadi latensi tidak
+        bergantung pada panjang histori.
+        """
+        symbol = symbol.strip().upper()
+        if symbol not in self._index:
+            raise KeyError(f"Emiten {symbol} tidak ada di store {self.root}")
+        rows = self._index[symbol]["rows"]
+        if rows == 0:
+            empty = {col: np.empty(0, dtype=dt) for col, dt in COLUMNS.items()}
+            return OHLCVSlice(symbol=symbol, **empty)
+
+        ts = self._memmap(symbol, "ts", rows)
+        lo = 0 if start is None else int(np.searchsorted(ts, _to_ns(start), side="left"))
+        hi = rows if end is None else int(np.searchsorted(ts, _to_ns(end), side="right"))
+        cols = {"ts": ts[lo:hi]}
+        for col in ("open", "high", "low", "close", "volume"):
+            cols[col] = self._memmap(symbol, col, rows)[lo:hi]
+        return OHLCVSlice(symbol=symbol, **cols)
+
+
+def benchmark_store(
+    root: str,
+    n_symbols: int = 20,
+    years: float = 2.0,
+    n_queries: int = 200,
+    seed: int = 7,
+) -> Dict[str, Any]:
+    """
+    Benchmark footprint & latensi range query store vs DataFrame float64.
+
+    Data dummy 1m (sesi BEI ~ 09:00-15:50, 5 hari/minggu) ditulis ke `root`,
+    lalu `n_queries` range query acak (1-30 hari) diukur.
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2020-01-01", periods=int(252 * years))
+    minutes = pd.timedelta_range("09:00:00", periods=410, freq="1min")
+    index = (days.values[:, None] + minutes.values[None, :]).ravel()
+    n = index.shape[0]
+
+    store = OHLCVStore(root)
+    for i in range(n_symbols):
+        close = 5000 * np.exp(np.cumsum(rng.normal(0, 0.0008, size=n)))
+        df = pd.DataFrame(
+            {
+                "Open": close,
+                "High": close * 1.001,
+                "Low": close * 0.999,
+                "Close": close,
+                "Volume": rng.integers(100, 50_000, size=n),
+            },
+            index=pd.DatetimeIndex(index),
+        )
+        store.write(f"SYM{i:04d}", df)
+    pandas_bytes = int(df.memory_usage(index=True, deep=True).sum())
+
+    latencies = np.empty(n_queries)
+    touched = 0
+    for q in range(n_queries):
+        sym = f"SYM{rng.integers(n_symbols):04d}"
+        d0 = rng.integers(0, len(days) - 30)
+        start, end = days[d0], days[d0 + rng.integers(1, 30)]
+        t0 = time.perf_counter()
+        sl = store.read_range(sym, start, end)
+        float(sl.close.mean())  # paksa baca halaman memmap
+        latencies[q] = time.perf_counter() - t0
+        touched += sl.nbytes
+
+    return {
+        "symbols": n_symbols,
+        "bars_per_symbol": n,
+        "store_bytes_per_symbol": n * BYTES_PER_BAR,
+        "pandas_bytes_per_symbol": pandas_bytes,
+        "query_p50_ms": float(np.percentile(latencies, 50) * 1e3),
+        "query_p99_ms": float(np.percentile(latencies, 99) * 1e3),
+        "avg_bytes_touched": touched / n_queries,
+    }
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(benchmark_store(tmp))
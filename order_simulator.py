@@ -0,0 +1,385 @@
+"""
+Simulator order berbasis event untuk Market / Limit / Stop / Trailing Stop / OCO.
+
+Order pending per emiten disimpan di struktur terindeks harga:
+- Buy limit  : max-heap harga limit  -> terisi saat Low  <= limit.
+- Sell limit : min-heap harga limit  -> terisi saat High >= limit.
+- Sell stop  : max-heap harga stop   -> terpicu saat Low  <= stop.
+- Buy stop   : min-heap harga stop   -> terpicu saat High >= stop.
+- Trailing   : array NumPy (referensi high/low, jarak trail) dievaluasi sekaligus.
+- OCO        : dua leg saling terhubung; leg yang terisi membatalkan pasangannya
+  (pembatalan lazy, order batal dibuang saat muncul di puncak heap).
+
+Per bar, tiap heap hanya di-pop selama puncaknya tersentuh range bar, jadi
+biaya sebanding dengan jumlah fill, bukan jumlah order terbuka.
+
+Aturan fill (konservatif):
+- Market: open bar berikutnya ± slippage.
+- Limit : open jika gap melewati limit (dibulatkan ke tick yang merugikan, maks.
+  harga limit), selain itu harga limit.
+- Stop/Trailing: open jika gap melewati stop, selain itu harga stop; ± slippage.
+- Dalam satu bar, stop diproses sebelum limit (skenario terburuk untuk OCO).
+- Harga limit/stop off-tick dibulatkan ke tick BEI ke arah yang tidak pernah
+  melewati harga order (buy limit & sell stop turun, sell limit & buy stop naik).
+- Semua harga fill dibulatkan ke fraksi harga (tick) BEI.
+
+Untuk produksi:
+- Fill nyata datang dari broker; simulator ini untuk paper trading & evaluasi.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import itertools
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from dataclasses import fields as dataclass_fields
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dummy_data import IDX_LOT_SIZE, IDX_TICK_SIZES
+
+_TICK_BOUNDS = np.array([b for b, _ in IDX_TICK_SIZES[:-1]], dtype=np.float64)
+_TICK_VALUES = np.array([t for _, t in IDX_TICK_SIZES], dtype=np.float64)
+_TICK_BOUNDS_LIST = _TICK_BOUNDS.tolist()
+_TICK_VALUES_LIST = _TICK_VALUES.tolist()
+_ROUND_SCALAR = {"up": math.ceil, "down": math.floor}
+_ROUND_ARRAY = {"up": np.ceil, "down": np.floor}
+_SCALAR = (int, float, np.integer, np.floating)
+
+BUY, SELL = "buy", "sell"
+MARKET, LIMIT, STOP, TRAILING_STOP = "market", "limit", "stop", "trailing_stop"
+
+
+def tick_size(price):
+    """Fraksi harga BEI untuk harga skalar/array."""
+    if isinstance(price, _SCALAR):
+        return _TICK_VALUES_LIST[bisect.bisect_right(_TICK_BOUNDS_LIST, price)]
+    return _TICK_VALUES[np.searchsorted(_TICK_BOUNDS, price, side="right")]
+
+
+def round_to_tick(price, side: str = "nearest"):
+    """Bulatkan harga ke fraksi BEI: 'up', 'down', atau 'nearest'."""
+    tick = tick_size(price)
+    if isinstance(price, _SCALAR):
+        return float(_ROUND_SCALAR.get(side, round)(price / tick) * tick)
+    return _ROUND_ARRAY.get(side, np.round)(np.asarray(price, dtype=np.float64) / tick) * tick
+
+
+@dataclass
+class Order:
+    symbol: str
+    side: str
+    qty: int
+    order_type: str = MARKET
+    limit_price: Optional[float] = None
+    stop_price: Optional[float] = None
+    trail_amount: Optional[float] = None
+    tag: str = ""
+    order_id: int = -1
+    status: str = "new"
+    oco_peer: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class Fill:
+    order_id: int
+    symbol: str
+    side: str
+    qty: int
+    price: float
+    ts: pd.Timestamp
+    order_type: str
+    tag: str = ""
+
+
+class _TrailingSet:
+    """Trailing stop satu emiten sebagai array paralel (dievaluasi per bar sekaligus)."""
+
+    def __init__(self) -> None:
+        self.ids = np.empty(0, dtype=np.int64)
+        self.is_sell = np.empty(0, dtype=bool)
+        self.trail = np.empty(0)
+        self.ref = np.empty(0)
+        self._pending: List[Tuple[int, bool, float, float]] = []
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0]) + len(self._pending)
+
+    def add(self, order_id: int, is_sell: bool, trail: float, ref: float) -> None:
+        self._pending.append((order_id, is_sell, trail, ref))
+
+    def _merge(self) -> None:
+        if not self._pending:
+            return
+        ids, is_sell, trail, ref = zip(*self._pending)
+        self.ids = np.concatenate([self.ids, np.array(ids, dtype=np.int64)])
+        self.is_sell = np.concatenate([self.is_sell, np.array(is_sell, dtype=bool)])
+        self.trail = np.concatenate([self.trail, np.array(trail)])
+        self.ref = np.concatenate([self.ref, np.array(ref)])
+        self._pending.clear()
+
+    def step(self, o: float, h: float, l: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (order_id, harga stop/gap) yang terpicu; sisanya update referensi."""
+        self._merge()
+        stop = np.where(self.is_sell, self.ref - self.trail, self.ref + self.trail)
+        hit = np.where(self.is_sell, l <= stop, h >= stop)
+        px = np.where(self.is_sell, np.minimum(o, stop), np.maximum(o, stop))
+        fired_ids, fired_px = self.ids[hit], px[hit]
+        keep = ~hit
+        self.ids, self.is_sell, self.trail = self.ids[keep], self.is_sell[keep], self.trail[keep]
+        self.ref = np.where(self.is_sell, np.maximum(self.ref[keep], h), np.minimum(self.ref[keep], l))
+        return fired_ids, fired_px
+
+    def drop(self, order_ids: Iterable[int]) -> None:
+        self._merge()
+        keep = ~np.isin(self.ids, np.fromiter(order_ids, dtype=np.int64))
+        self.ids, self.is_sell = self.ids[keep], self.is_sell[keep]
+        self.trail, self.ref = self.trail[keep], self.ref[keep]
+
+
+@dataclass
+class _Book:
+    market: List[int] = field(default_factory=list)
+    buy_limit: List[Tuple[float, int]] = field(default_factory=list)   # (-harga, id)
+    sell_limit: List[Tuple[float, int]] = field(default_factory=list)  # (harga, id)
+    buy_stop: List[Tuple[float, int]] = field(default_factory=list)    # (harga, id)
+    sell_stop: List[Tuple[float, int]] = field(default_factory=list)   # (-harga, id)
+    trailing: _TrailingSet = field(default_factory=_TrailingSet)
+    last_close: Optional[float] = None
+
+
+class OrderSimulator:
+    """
+    Book order per emiten + replay bar OHLC.
+
+    Contoh:
+        sim = OrderSimulator(slippage_ticks=1)
+        sim.submit(Order("BBCA", "buy", 500, "limit", limit_price=9000))
+        fills = sim.replay({"BBCA": df_prices})
+    """
+
+    def __init__(self, slippage_ticks: int = 1) -> None:
+        self.slippage_ticks = slippage_ticks
+        self.orders: Dict[int, Order] = {}
+        self.books: Dict[str, _Book] = {}
+        self.fills: List[Fill] = []
+        self._ids = itertools.count(1)
+
+    # --- submit / cancel -------------------------------------------------
+    def submit(self, order: Order, ref_price: Optional[float] = None) -> int:
+        """
+        Daftarkan order. `ref_price` = harga acuan awal trailing stop
+        (default: close terakhir emiten yang sudah direplay).
+        """
+        if order.side not in (BUY, SELL):
+            raise ValueError(f"Side tidak dikenal: {order.side}")
+        if order.qty <= 0 or order.qty % IDX_LOT_SIZE:
+            raise ValueError(f"Qty harus kelipatan {IDX_LOT_SIZE} lembar.")
+        if order.order_type == LIMIT and (order.limit_price is None or order.limit_price <= 0):
+            raise ValueError("Order limit butuh limit_price > 0.")
+        if order.order_type == STOP and (order.stop_price is None or order.stop_price <= 0):
+            raise ValueError("Order stop butuh stop_price > 0.")
+
+        order.symbol = order.symbol.strip().upper()
+        order.order_id = next(self._ids)
+        order.status = "open"
+        self.orders[order.order_id] = order
+        book = self.books.setdefault(order.symbol, _Book())
+        oid, is_buy = order.order_id, order.side == BUY
+
+        if order.order_type == MARKET:
+            book.market.append(oid)
+        elif order.order_type == LIMIT:
+            # Limit dibulatkan ke dalam (buy turun, sell naik): tidak pernah terisi melewati harga trader
+            price = round_to_tick(order.limit_price, "down" if is_buy else "up")
+            order.limit_price = price
+            heapq.heappush(book.buy_limit if is_buy else book.sell_limit, (-price if is_buy else price, oid))
+        elif order.order_type == STOP:
+            # Stop dibulatkan menjauh dari pasar (buy naik, sell turun): tidak pernah terpicu lebih awal
+            price = round_to_tick(order.stop_price, "up" if is_buy else "down")
+            order.stop_price = price
+            heapq.heappush(book.buy_stop if is_buy else book.sell_stop, (price if is_buy else -price, oid))
+        elif order.order_type == TRAILING_STOP:
+            ref = ref_price if ref_price is not None else book.last_close
+            if ref is None or not order.trail_amount:
+                raise ValueError("Trailing stop butuh trail_amount dan harga acuan.")
+            book.trailing.add(oid, not is_buy, float(order.trail_amount), float(ref))
+        else:
+            raise ValueError(f"Tipe order tidak dikenal: {order.order_type}")
+        return oid
+
+    def submit_oco(self, first: Order, second: Order, ref_price: Optional[float] = None) -> Tuple[int, int]:
+        """Dua order terhubung: fill salah satu membatalkan yang lain."""
+        a = self.submit(first, ref_price)
+        b = self.submit(second, ref_price)
+        self.orders[a].oco_peer, self.orders[b].oco_peer = b, a
+        return a, b
+
+    def cancel(self, order_id: int) -> None:
+        order = self.orders.get(order_id)
+        if order is None or order.status != "open":
+            return
+        order.status = "cancelled"
+        if order.order_type == TRAILING_STOP:
+            self.books[order.symbol].trailing.drop([order_id])
+
+    def open_orders(self) -> int:
+        return sum(1 for o in self.orders.values() if o.status == "open")
+
+    # --- matching --------------------------------------------------------
+    def _slip(self, price: float, side: str) -> float:
+        if not self.slippage_ticks:
+            return round_to_tick(price, "up" if side == BUY else "down")
+        tick = float(tick_size(price))
+        if side == BUY:
+            return round_to_tick(price + self.slippage_ticks * tick, "up")
+        return round_to_tick(price - self.slippage_ticks * tick, "down")
+
+    def _fill(self, oid: int, price: float, ts: pd.Timestamp, out: List[Fill]) -> None:
+        order = self.orders[oid]
+        if order.status != "open":
+            return
+        order.status = "filled"
+        out.append(Fill(oid, order.symbol, order.side, order.qty, price, ts, order.order_type, order.tag))
+        if order.oco_peer is not None:
+            self.cancel(order.oco_peer)
+
+    def _pop_while(self, heap: List[Tuple[float, int]], touched) -> Iterable[Tuple[float, int]]:
+        while heap and touched(heap[0][0]):
+            key, oid = heapq.heappop(heap)
+            if self.orders[oid].status == "open":
+                yield key, oid
+
+    def process_bar(self, symbol: str, ts: pd.Timestamp, o: float, h: float, l: float, c: float) -> List[Fill]:
+        """Cocokkan semua order terbuka satu emiten terhadap satu bar OHLC."""
+        book = self.books.get(symbol)
+        out: List[Fill] = []
+        if book is None:
+            return out
+
+        for oid in book.market:
+            self._fill(oid, self._slip(o, self.orders[oid].side), ts, out)
+        book.market.clear()
+
+        for key, oid in self._pop_while(book.sell_stop, lambda k: -k >= l):
+            self._fill(oid, self._slip(min(o, -key), SELL), ts, out)
+        for key, oid in self._pop_while(book.buy_stop, lambda k: k <= h):
+            self._fill(oid, self._slip(max(o, key), BUY), ts, out)
+        if len(book.trailing):
+            ids, prices = book.trailing.step(o, h, l)
+            for oid, px in zip(ids.tolist(), prices.tolist()):
+                self._fill(oid, self._slip(px, self.orders[oid].side), ts, out)
+
+        # Gap melewati limit: fill di open, dibulatkan ke arah yang merugikan
+        # tapi tidak pernah lebih buruk dari harga limit.
+        for key, oid in self._pop_while(book.buy_limit, lambda k: -k >= l):
+            self._fill(oid, min(round_to_tick(min(o, -key), "up"), -key), ts, out)
+        for key, oid in self._pop_while(book.sell_limit, lambda k: k <= h):
+            self._fill(oid, max(round_to_tick(max(o, key), "down"), key), ts, out)
+
+        book.last_close = c
+        self.fills.extend(out)
+        return out
+
+    def replay(self, frames: Mapping[str, pd.DataFrame]) -> List[Fill]:
+        """Replay DataFrame OHLC per emiten; return fill terurut waktu."""
+        out: List[Fill] = []
+        for symbol, df in frames.items():
+            sym = symbol.strip().upper()
+            cols = df[["Open", "High", "Low", "Close"]].to_numpy(dtype=np.float64)
+            for ts, (o, h, l, c) in zip(df.index, cols):
+                out.extend(self.process_bar(sym, ts, o, h, l, c))
+        out.sort(key=lambda f: (f.ts, f.order_id))
+        return out
+
+
+def fills_frame(fills: Iterable[Fill]) -> pd.DataFrame:
+    """DataFrame fill (satu baris per fill)."""
+    return pd.DataFrame([asdict(f) for f in fills], columns=[f.name for f in dataclass_fields(Fill)])
+
+
+def fills_to_trades(fills: Iterable[Fill]) -> pd.DataFrame:
+    """Pasangkan fill buy -> sell (FIFO, long-only) per emiten menjadi round-trip trade."""
+    lots: Dict[str, List[List]] = {}
+    rows = []
+    for f in sorted(fills, key=lambda f: (f.ts, f.order_id)):
+        queue = lots.setdefault(f.symbol, [])
+        if f.side == BUY:
+            queue.append([f.qty, f.price, f.ts])
+            continue
+        remaining = f.qty
+        while remaining and queue:
+            qty = min(remaining, queue[0][0])
+            rows.append({
+                "symbol": f.symbol,
+                "entry_ts": queue[0][2],
+                "exit_ts": f.ts,
+                "qty": qty,
+                "entry_price": queue[0][1],
+                "exit_price": f.price,
+                "pnl": (f.price - queue[0][1]) * qty,
+            })
+            queue[0][0] -= qty
+            remaining -= qty
+            if queue[0][0] == 0:
+                queue.pop(0)
+    return pd.DataFrame(rows, columns=["symbol", "entry_ts", "exit_ts", "qty", "entry_price", "exit_price", "pnl"])
+
+
+def trade_metrics(trades: pd.DataFrame) -> Dict[str, float]:
+    """Metrik ringkas (format sama dengan `simple_backtest`) dari round-trip trade."""
+    pnl = trades["pnl"].to_numpy(dtype=np.float64) if len(trades) else np.empty(0)
+    win_sum = float(pnl[pnl > 0].sum())
+    loss_sum = float(-pnl[pnl <= 0].sum())
+    return {
+        "win_rate": float((pnl > 0).mean() * 100) if pnl.size else 0.0,
+        "profit_factor": (win_sum / loss_sum) if loss_sum > 0 else (win_sum if win_sum > 0 else 1.0),
+        "total_trades": float(pnl.size),
+        "net_pnl": float(pnl.sum()),
+    }
+
+
+def benchmark_order_simulator(n_orders: int = 100_000, n_symbols: int = 50, n_bars: int = 250) -> Dict[str, float]:
+    """Ukur throughput matching (fill/detik) dengan `n_orders` order terbuka."""
+    from synthetic_market import generate_universe
+
+    market = generate_universe([f"SIM{i:03d}" for i in range(n_symbols)], n_bars + 1)
+    rng = np.random.default_rng(11)
+    sim = OrderSimulator()
+    sym_idx = rng.integers(n_symbols, size=n_orders)
+    kinds = rng.integers(4, size=n_orders)
+    offsets = rng.uniform(0.01, 0.3, size=n_orders)
+    for i in range(n_orders):
+        s = int(sym_idx[i])
+        ref = float(market.close[s, 0])
+        sym = market.symbols[s]
+        if kinds[i] == 0:
+            sim.submit(Order(sym, BUY, 100, LIMIT, limit_price=ref * (1 - offsets[i])))
+        elif kinds[i] == 1:
+            sim.submit(Order(sym, SELL, 100, LIMIT, limit_price=ref * (1 + offsets[i])))
+        elif kinds[i] == 2:
+            sim.submit(Order(sym, SELL, 100, STOP, stop_price=ref * (1 - offsets[i])))
+        else:
+            sim.submit(Order(sym, SELL, 100, TRAILING_STOP, trail_amount=ref * offsets[i]), ref_price=ref)
+
+    frames = {sym: market.frame(sym).iloc[1:] for sym in market.symbols}
+    t0 = time.perf_counter()
+    fills = sim.replay(frames)
+    elapsed = time.perf_counter() - t0
+    return {
+        "orders": n_orders,
+        "bars": n_bars * n_symbols,
+        "fills": len(fills),
+        "seconds": elapsed,
+        "fills_per_sec": len(fills) / elapsed if elapsed else 0.0,
+        "bars_per_sec": n_bars * n_symbols / elapsed if elapsed else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark_order_simulator())
@@ -0,0 +1,146 @@
+"""
+Position sizing & risk batch untuk seluruh universe.
+
+Menggantikan perhitungan inline di Risk Management Calculator (`app.py`) dengan
+satu panggilan tervektorisasi:
+- Stop berbasis persentase (`stop_pct`) atau ATR (`atr * atr_mult`).
+- Budget risiko per trade = modal × `risk_pct`%.
+- Jumlah saham dibulatkan ke bawah ke lot BEI (100 lembar) dan dibatasi modal.
+
+Dipakai oleh tab Perencanaan (grid sensitivitas risk% × stop%) dan screener
+(sizing semua kandidat sekaligus).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from dummy_data import IDX_LOT_SIZE
+
+ArrayLike = Union[float, Sequence[float], np.ndarray, pd.Series]
+
+
+def compute_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    """Average True Range (smoothing Wilder) dari DataFrame OHLC."""
+    prev_close = df["Close"].shift(1)
+    tr = pd.concat(
+        [df["High"] - df["Low"], (df["High"] - prev_close).abs(), (df["Low"] - prev_close).abs()],
+        axis=1,
+    ).max(axis=1)
+    return tr.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+
+
+def size_positions(
+    symbols: Sequence[str],
+    last_price: ArrayLike,
+    capital: float,
+    risk_pct: ArrayLike = 1.0,
+    stop_pct: Optional[ArrayLike] = None,
+    atr: Optional[ArrayLike] = None,
+    atr_mult: float = 2.0,
+    lot_size: int = IDX_LOT_SIZE,
+) -> pd.DataFrame:
+    """
+    Hitung ukuran posisi untuk banyak emiten sekaligus.
+
+    - `stop_pct` (persen dari harga) dipakai jika diberikan; selain itu jarak
+      stop = `atr * atr_mult`. Salah satunya wajib ada.
+    - `risk_pct` boleh skalar (sama untuk semua) atau array per emiten.
+
+    Return DataFrame per emiten: stop_distance, stop_price, risk_budget, shares
+    (sebelum lot), lots, qty (lembar, kelipatan lot), capital_used, risk_at_stop.
+    """
+    n = len(symbols)
+    price = np.broadcast_to(np.asarray(last_price, dtype=np.float64), (n,))
+    risk = np.broadcast_to(np.asarray(risk_pct, dtype=np.float64), (n,))
+
+    if stop_pct is not None:
+        stop_dist = price * np.broadcast_to(np.asarray(stop_pct, dtype=np.float64), (n,)) / 100.0
+    elif atr is not None:
+        stop_dist = np.broadcast_to(np.asarray(atr, dtype=np.float64), (n,)) * atr_mult
+    else:
+        raise ValueError("Isi salah satu dari stop_pct atau atr.")
+
+    risk_budget = capital * risk / 100.0
+    ok = np.isfinite(stop_dist) & (stop_dist > 0) & np.isfinite(price) & (price > 0)
+    shares = np.where(ok, np.floor(np.divide(risk_budget, stop_dist, out=np.zeros(n), where=ok)), 0.0)
+    affordable = np.where(ok, np.floor(np.divide(capital, price, out=np.zeros(n), where=ok)), 0.0)
+    lots = np.floor(np.minimum(shares, affordable) / lot_size).astype(np.int64)
+    qty = lots * lot_size
+
+    return pd.DataFrame(
+        {
+            "last_price": price,
+            "stop_distance": stop_dist,
+            "stop_price": price - stop_dist,
+            "risk_budget": risk_budget,
+            "shares": shares.astype(np.int64),
+            "lots": lots,
+            "qty": qty,
+            "capital_used": np.where(ok, qty * price, 0.0),
+            "risk_at_stop": np.where(ok, qty * stop_dist, 0.0),
+        },
+        index=pd.Index(list(symbols), name="symbol"),
+    )
+
+
+def portfolio_risk_totals(sizes: pd.DataFrame, capital: float) -> Dict[str, float]:
+    """
+    Agregat level portofolio dari hasil `size_positions`. `over_allocated` = 1.0
+    jika total modal terpakai melebihi `capital` (tiap emiten di-sizing
+    terhadap modal penuh secara terpisah); gunakan `fit_to_capital`.
+    """
+    used = float(sizes["capital_used"].sum())
+    risk = float(sizes["risk_at_stop"].sum())
+    return {
+        "positions": float((sizes["qty"] > 0).sum()),
+        "capital_used": used,
+        "capital_used_pct": used / capital * 100.0 if capital else 0.0,
+        "total_risk": risk,
+        "total_risk_pct": risk / capital * 100.0 if capital else 0.0,
+        "over_allocated": float(used > capital),
+    }
+
+
+def fit_to_capital(sizes: pd.DataFrame, capital: float, lot_size: int = IDX_LOT_SIZE) -> pd.DataFrame:
+    """
+    Skalakan lot semua emiten secara proporsional (dibulatkan ke bawah per lot)
+    agar total `capital_used` <= `capital`. Sizing yang sudah muat dikembalikan apa adanya.
+    """
+    used = float(sizes["capital_used"].sum())
+    if used <= capital or used == 0:
+        return sizes
+    out = sizes.copy()
+    out["lots"] = np.floor(out["lots"].to_numpy() * (capital / used)).astype(np.int64)
+    out["qty"] = out["lots"] * lot_size
+    out["capital_used"] = out["qty"] * out["last_price"]
+    out["risk_at_stop"] = out["qty"] * out["stop_distance"]
+    return out
+
+
+def sensitivity_grid(
+    last_price: float,
+    capital: float,
+    risk_pcts: Sequence[float],
+    stop_pcts: Sequence[float],
+    lot_size: int = IDX_LOT_SIZE,
+) -> pd.DataFrame:
+    """
+    Grid lot (baris = risk %, kolom = stop %) untuk satu emiten, dihitung
+    sekaligus lewat broadcasting.
+    """
+    risk = np.asarray(risk_pcts, dtype=np.float64)[:, None]
+    stop = np.asarray(stop_pcts, dtype=np.float64)[None, :]
+    lots = np.zeros((risk.shape[0], stop.shape[1]), dtype=np.int64)
+    if last_price > 0:
+        stop_dist = last_price * stop / 100.0
+        shares = np.minimum(np.floor(capital * risk / 100.0 / stop_dist), np.floor(capital / last_price))
+        lots = np.floor(shares / lot_size).astype(np.int64)
+    return pd.DataFrame(
+        lots,
+        index=pd.Index([f"{r:g}%" for r in risk_pcts], name="Risk"),
+        columns=pd.Index([f"{s:g}%" for s in stop_pcts], name="Stop"),
+    )
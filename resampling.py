@@ -0,0 +1,145 @@
+"""
+Engine resampling OHLCV & piramida multi-timeframe.
+
+Agregasi yang benar per kolom: Open=first, High=max, Low=min, Close=last,
+Volume=sum. Karena kelima agregasi ini komposabel, piramida
+15min -> 1h -> 1D -> 1W dibangun bertingkat dari level sebelumnya
+(setiap level lebih kecil dari level di bawahnya), sekali per data dasar.
+
+`get_price_data` menyimpan piramida di cache proses, sehingga pindah timeframe
+di sidebar cukup lookup level tanpa fetch ulang maupun resample ulang.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import OHLCVSlice
+
+OHLCV_AGG: Dict[str, str] = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+}
+
+# Urutan level piramida (rule pandas) dan mapping dari pilihan timeframe UI.
+PYRAMID_RULES: Tuple[str, ...] = ("15min", "1h", "1D", "1W")
+TIMEFRAME_RULES: Dict[str, str] = {"1m": "15min", "1h": "1h", "1d": "1D", "1w": "1W"}
+
+_NS_PER: Dict[str, int] = {
+    "15min": 15 * 60 * 10**9,
+    "1h": 3600 * 10**9,
+    "1D": 86400 * 10**9,
+    "1W": 7 * 86400 * 10**9,
+}
+# Epoch 1970-01-01 jatuh di hari Kamis; geser 4 hari agar bucket mingguan mulai Senin.
+_WEEK_OFFSET_NS = 4 * 86400 * 10**9
+
+
+def resample_ohlcv(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """Resample DataFrame OHLCV dalam satu pass groupby dengan agregasi per kolom."""
+    agg = {col: fn for col, fn in OHLCV_AGG.items() if col in df.columns}
+    out = df.resample(rule).agg(agg)
+    return out.dropna(subset=["Close"]) if "Close" in out.columns else out.dropna()
+
+
+def resample_slice(sl: OHLCVSlice, rule: str) -> pd.DataFrame:
+    """
+    Resample slice `OHLCVStore` langsung dari array memmap (tanpa DataFrame 1m).
+
+    Bucket dihitung dengan integer division pada timestamp, lalu tiap kolom
+    direduksi sekali dengan `ufunc.reduceat`. Label mengikuti konvensi pandas:
+    kiri untuk intraday/harian, Minggu penutup untuk mingguan (W-SUN).
+    """
+    if rule not in _NS_PER:
+        return resample_ohlcv(sl.to_frame(), rule)
+    if sl.empty:
+        return pd.DataFrame(columns=list(OHLCV_AGG), index=pd.DatetimeIndex([]))
+
+    width = _NS_PER[rule]
+    offset = _WEEK_OFFSET_NS if rule == "1W" else 0
+    ts = np.asarray(sl.ts)
+    bucket = (ts - offset) // width
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(ts)] - 1
+
+    label = bucket[starts] * width + offset
+    if rule == "1W":
+        label = label + 6 * 86400 * 10**9
+    return pd.DataFrame(
+        {
+            "Open": np.asarray(sl.open)[starts],
+            "High": np.maximum.reduceat(np.asarray(sl.high), starts),
+            "Low": np.minimum.reduceat(np.asarray(sl.low), starts),
+            "Close": np.asarray(sl.close)[ends],
+            "Volume": np.add.reduceat(np.asarray(sl.volume), starts),
+        },
+        index=pd.DatetimeIndex(label.view("datetime64[ns]")),
+    )
+
+
+class OHLCVPyramid:
+    """Level-level timeframe yang dibangun sekali dari satu data dasar."""
+
+    def __init__(self, levels: Dict[str, pd.DataFrame]) -> None:
+        self.levels = levels
+
+    @classmethod
+    def build(cls, base: pd.DataFrame) -> "OHLCVPyramid":
+        levels: Dict[str, pd.DataFrame] = {}
+        prev = base
+        for rule in PYRAMID_RULES:
+            prev = levels[rule] = resample_ohlcv(prev, rule)
+        return cls(levels)
+
+    @classmethod
+    def build_from_slice(cls, sl: OHLCVSlice) -> "OHLCVPyramid":
+        levels = {PYRAMID_RULES[0]: resample_slice(sl, PYRAMID_RULES[0])}
+        prev = levels[PYRAMID_RULES[0]]
+        for rule in PYRAMID_RULES[1:]:
+            prev = levels[rule] = resample_ohlcv(prev, rule)
+        return cls(levels)
+
+    def get(self, timeframe: str) -> pd.DataFrame:
+        """Ambil level untuk timeframe UI ('1m'/'1h'/'1d'/'1w'); default harian."""
+        return self.levels[TIMEFRAME_RULES.get(timeframe, "1D")]
+
+
+class PyramidCache:
+    """Cache LRU thread-safe untuk piramida per (emiten, periode, sumber, tanggal)."""
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, OHLCVPyramid]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[OHLCVPyramid]:
+        with self._lock:
+            pyr = self._data.get(key)
+            if pyr is not None:
+                self._data.move_to_end(key)
+            return pyr
+
+    def put(self, key: Hashable, pyramid: OHLCVPyramid) -> None:
+        with self._lock:
+            self._data[key] = pyramid
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+PYRAMID_CACHE = PyramidCache()
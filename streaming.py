@@ -0,0 +1,411 @@
+"""
+Pipeline streaming harga (live / replay) berbasis asyncio.
+
+Alur:
+    FeedSource --(asyncio.Queue terbatas, backpressure)--> StreamEngine
+        -> indicator_stage (RSI Wilder, EMA, Bollinger, MACD inkremental per emiten)
+        -> signal_stage    (aturan entry/exit yang sama dengan `simple_backtest`)
+        -> alert_stage     (alert harga naik/turun melewati level)
+
+Sumber data:
+- `ReplaySource`  : memutar bar 1m tersimpan/sintetis dengan speedup tertentu
+                    (`speedup=None` = secepat mungkin, untuk load test).
+- `CallbackSource`: sumber live pluggable; adapter broker/vendor cukup memanggil
+                    `push(bar)` dari websocket/poller masing-masing.
+
+Setiap bar dicap waktu saat keluar dari sumber; latensi tick-to-signal
+(sampai alert_stage selesai) dicatat dan dilaporkan sebagai persentil.
+
+Untuk produksi:
+- Jalankan engine di proses/worker terpisah dari Streamlit, kirim event via pub/sub.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from ohlcv_store import OHLCVStore
+
+_END = object()
+
+
+@dataclass
+class Bar:
+    symbol: str
+    ts: pd.Timestamp
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    recv_ns: int = 0
+
+
+@dataclass
+class StreamEvent:
+    """Bar yang sudah diperkaya indikator, sinyal, dan alert."""
+
+    bar: Bar
+    indicators: Dict[str, float] = field(default_factory=dict)
+    signal: Optional[str] = None
+    alerts: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AlertRule:
+    symbol: str
+    level: float
+    direction: str = "above"  # 'above' atau 'below'
+    triggered: bool = False
+
+
+# --- sumber data -------------------------------------------------------------
+class FeedSource:
+    """Antarmuka sumber bar; subclass mengimplementasikan `stream()`."""
+
+    async def stream(self) -> AsyncIterator[Bar]:  # pragma: no cover - antarmuka
+        raise NotImplementedError
+        yield
+
+
+class ReplaySource(FeedSource):
+    """
+    Replay DataFrame OHLCV per emiten, diurutkan waktu lintas emiten.
+    Jeda antar timestamp = selisih waktu bar / `speedup` (None = tanpa jeda).
+    """
+
+    def __init__(self, frames: Mapping[str, pd.DataFrame], speedup: Optional[float] = 60.0) -> None:
+        self.frames = frames
+        self.speedup = speedup
+
+    @classmethod
+    def from_symbols(
+        cls,
+        symbols: Iterable[str],
+        n_bars: int = 390,
+        store: Optional["OHLCVStore"] = None,
+        speedup: Optional[float] = 60.0,
+    ) -> "ReplaySource":
+        """
+        Bar 1m terakhir per emiten: dari `OHLCVStore` jika tersedia, selain
+        itu sintetis (deterministik per simbol) untuk satu sesi bursa.
+        """
+        from synthetic_market import synthetic_ohlcv
+
+        session = pd.Timestamp.today().normalize() + pd.Timedelta(hours=9)
+        index = pd.date_range(session, periods=n_bars, freq="1min")
+        frames: Dict[str, pd.DataFrame] = {}
+        for sym in symbols:
+            sym = sym.strip().upper()
+            if store is not None and sym in store:
+                sl = store.read_range(sym)
+                frames[sym] = sl.slice_rows(max(len(sl) - n_bars, 0)).to_frame()
+            else:
+                frames[sym] = synthetic_ohlcv(sym, index)
+        return cls(frames, speedup=speedup)
+
+    def _merged(self) -> pd.DataFrame:
+        parts = [
+            df[["Open", "High", "Low", "Close", "Volume"]].assign(symbol=sym.strip().upper())
+            for sym, df in self.frames.items()
+        ]
+        merged = pd.concat(parts).rename_axis("ts").reset_index()
+        return merged.sort_values("ts", kind="stable")
+
+    async def stream(self) -> AsyncIterator[Bar]:
+        merged = self._merged()
+        ts_ns = merged["ts"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        cols = merged[["Open", "High", "Low", "Close", "Volume"]].to_numpy(dtype=np.float64)
+        symbols = merged["symbol"].to_numpy()
+        prev = ts_ns[0] if len(ts_ns) else 0
+        for i in range(len(ts_ns)):
+            if self.speedup and ts_ns[i] > prev:
+                await asyncio.sleep((ts_ns[i] - prev) / 1e9 / self.speedup)
+            prev = ts_ns[i]
+            o, h, l, c, v = cols[i]
+            yield Bar(symbols[i], pd.Timestamp(ts_ns[i]), o, h, l, c, v, time.perf_counter_ns())
+
+
+class CallbackSource(FeedSource):
+    """Sumber live: adapter eksternal memanggil `push()`; `close()` mengakhiri stream."""
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    async def push(self, bar: Bar) -> None:
+        bar.recv_ns = time.perf_counter_ns()
+        await self._queue.put(bar)
+
+    async def close(self) -> None:
+        await self._queue.put(_END)
+
+    async def stream(self) -> AsyncIterator[Bar]:
+        while True:
+            bar = await self._queue.get()
+            if bar is _END:
+                return
+            yield bar
+
+
+# --- indikator inkremental ---------------------------------------------------
+class _SeededEMA:
+    """
+    Smoothing eksponensial inkremental dengan seeding TA-Lib: output pertama
+    (setelah `warmup` input) = SMA `period` input terakhir, sebelumnya NaN.
+    """
+
+    __slots__ = ("alpha", "warmup", "recent", "count", "value")
+
+    def __init__(self, period: int, alpha: float, warmup: Optional[int] = None) -> None:
+        self.alpha = alpha
+        self.warmup = warmup or period
+        self.recent: Deque[float] = deque(maxlen=period)
+        self.count = 0
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count < self.warmup:
+            self.recent.append(x)
+        elif self.count == self.warmup:
+            self.recent.append(x)
+            self.value = sum(self.recent) / len(self.recent)
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class _SymbolState:
+    """
+    State indikator satu emiten, diperbarui O(1) per bar. Seeding & lookback
+    sama dengan `indicator_kernels`/TA-Lib, jadi nilainya identik dengan
+    `compute_indicators` (NaN selama warm-up).
+    """
+
+    def __init__(self, rsi_period: int, ema_period: int, bb_period: int) -> None:
+        self.bb_period = bb_period
+        self.ema = _SeededEMA(ema_period, 2.0 / (ema_period + 1))
+        self.avg_gain = _SeededEMA(rsi_period, 1.0 / rsi_period)
+        self.avg_loss = _SeededEMA(rsi_period, 1.0 / rsi_period)
+        # MACD(12, 26, 9): EMA cepat diseed pada bar ke-26 seperti TA-Lib
+        self.ema_fast = _SeededEMA(12, 2.0 / 13, warmup=26)
+        self.ema_slow = _SeededEMA(26, 2.0 / 27)
+        self.macd_signal = _SeededEMA(9, 2.0 / 10)
+        self.prev_close = math.nan
+        self.window: Deque[float] = deque()
+        self.win_sum = self.win_sumsq = 0.0
+        self.ready_bars = 0
+        self.in_position = False
+
+    def update(self, close: float) -> Dict[str, float]:
+        ema = self.ema.update(close)
+        rsi = math.nan
+        if not math.isnan(self.prev_close):
+            change = close - self.prev_close
+            gain = self.avg_gain.update(max(change, 0.0))
+            loss = self.avg_loss.update(max(-change, 0.0))
+            if not math.isnan(gain):
+                rsi = 100.0 * gain / (gain + loss) if gain + loss > 0 else 0.0
+        self.prev_close = close
+
+        macd = self.ema_fast.update(close) - self.ema_slow.update(close)
+        signal = math.nan
+        if not math.isnan(macd):
+            signal = self.macd_signal.update(macd)
+            if math.isnan(signal):
+                macd = math.nan
+
+        self.window.append(close)
+        self.win_sum += close
+        self.win_sumsq += close * close
+        if len(self.window) > self.bb_period:
+            old = self.window.popleft()
+            self.win_sum -= old
+            self.win_sumsq -= old * old
+        mid = std = math.nan
+        if len(self.window) == self.bb_period:
+            mid = self.win_sum / self.bb_period
+            std = math.sqrt(max(self.win_sumsq / self.bb_period - mid * mid, 0.0))
+        return {
+            "RSI": rsi,
+            "EMA": ema,
+            "BB_upper": mid + 2 * std,
+            "BB_middle": mid,
+            "BB_lower": mid - 2 * std,
+            "MACD": macd,
+            "MACD_signal": signal,
+        }
+
+
+# --- tahap pipeline (generator) ---------------------------------------------
+def indicator_stage(
+    bars: Iterable[Bar],
+    states: Dict[str, _SymbolState],
+    rsi_period: int = 14,
+    ema_period: int = 20,
+    bb_period: int = 20,
+) -> Iterator[StreamEvent]:
+    for bar in bars:
+        state = states.get(bar.symbol)
+        if state is None:
+            state = states[bar.symbol] = _SymbolState(rsi_period, ema_period, bb_period)
+        yield StreamEvent(bar, state.update(bar.close))
+
+
+def signal_stage(events: Iterable[StreamEvent], states: Dict[str, _SymbolState]) -> Iterator[StreamEvent]:
+    """
+    Entry: Close > EMA & RSI > 50; exit: Close < EMA atau RSI < 45. Seperti
+    `simple_backtest` pada hasil `compute_indicators(...).dropna()`, aturan
+    baru dievaluasi mulai bar kedua setelah semua indikator terisi.
+    """
+    for ev in events:
+        rsi, ema, close = ev.indicators["RSI"], ev.indicators["EMA"], ev.bar.close
+        state = states[ev.bar.symbol]
+        if state.ready_bars < 2 and not any(math.isnan(v) for v in ev.indicators.values()):
+            state.ready_bars += 1
+        if state.ready_bars >= 2:
+            if not state.in_position and close > ema and rsi > 50:
+                state.in_position, ev.signal = True, "buy"
+            elif state.in_position and (close < ema or rsi < 45):
+                state.in_position, ev.signal = False, "sell"
+        yield ev
+
+
+def alert_stage(events: Iterable[StreamEvent], rules: Mapping[str, List[AlertRule]]) -> Iterator[StreamEvent]:
+    for ev in events:
+        for rule in rules.get(ev.bar.symbol, ()):
+            if rule.triggered:
+                continue
+            hit = ev.bar.high >= rule.level if rule.direction == "above" else ev.bar.low <= rule.level
+            if hit:
+                rule.triggered = True
+                ev.alerts.append(f"{ev.bar.symbol} {rule.direction} {rule.level:,.0f}")
+        yield ev
+
+
+# --- engine ------------------------------------------------------------------
+class LatencyRecorder:
+    """Ring buffer latensi (ns) dengan ringkasan persentil dalam milidetik."""
+
+    def __init__(self, capacity: int = 1_000_000) -> None:
+        self._buf = np.empty(capacity, dtype=np.int64)
+        self._n = 0
+
+    def record(self, values_ns: np.ndarray) -> None:
+        cap = self._buf.shape[0]
+        idx = (self._n + np.arange(values_ns.shape[0])) % cap
+        self._buf[idx] = values_ns
+        self._n += values_ns.shape[0]
+
+    def percentiles(self) -> Dict[str, float]:
+        data = self._buf[: min(self._n, self._buf.shape[0])]
+        if data.size == 0:
+            return {"count": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        p50, p95, p99 = (float(v) for v in np.percentile(data, [50, 95, 99]) / 1e6)
+        return {"count": float(self._n), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": float(data.max()) / 1e6}
+
+
+class StreamEngine:
+    """
+    Hubungkan `FeedSource` ke pipeline lewat antrean terbatas. Produsen
+    menunggu (`await put`) saat antrean penuh, sehingga sumber cepat tidak
+    membanjiri memori; konsumen memproses bar per micro-batch.
+    """
+
+    def __init__(
+        self,
+        source: FeedSource,
+        alerts: Iterable[AlertRule] = (),
+        queue_size: int = 4096,
+        batch_size: int = 64,
+        on_event: Optional[Callable[[StreamEvent], None]] = None,
+    ) -> None:
+        self.source = source
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.on_event = on_event
+        self.rules: Dict[str, List[AlertRule]] = {}
+        for rule in alerts:
+            self.rules.setdefault(rule.symbol.strip().upper(), []).append(rule)
+        self.states: Dict[str, _SymbolState] = {}
+        self.latency = LatencyRecorder()
+        self.backpressure_waits = 0
+        self.processed = 0
+        self.signals: List[StreamEvent] = []
+
+    async def _produce(self, queue: asyncio.Queue) -> None:
+        async for bar in self.source.stream():
+            if queue.full():
+                self.backpressure_waits += 1
+            await queue.put(bar)
+            if queue.qsize() >= self.batch_size:
+                # Beri giliran ke konsumen agar satu burst timestamp tidak antre utuh
+                await asyncio.sleep(0)
+        await queue.put(_END)
+
+    def _process(self, batch: List[Bar]) -> None:
+        done_ns = np.empty(len(batch), dtype=np.int64)
+        recv_ns = np.fromiter((b.recv_ns for b in batch), dtype=np.int64, count=len(batch))
+        events = alert_stage(signal_stage(indicator_stage(batch, self.states), self.states), self.rules)
+        for i, ev in enumerate(events):
+            done_ns[i] = time.perf_counter_ns()
+            if ev.signal or ev.alerts:
+                self.signals.append(ev)
+            if self.on_event is not None:
+                self.on_event(ev)
+        self.latency.record(done_ns - recv_ns)
+        self.processed += len(batch)
+
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            finished = batch[-1] is _END
+            if finished:
+                batch.pop()
+            if batch:
+                self._process(batch)
+            if finished:
+                return
+
+    async def run(self) -> Dict[str, float]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        t0 = time.perf_counter()
+        await asyncio.gather(self._produce(queue), self._consume(queue))
+        elapsed = time.perf_counter() - t0
+        return {
+            **self.latency.percentiles(),
+            "bars": float(self.processed),
+            "bars_per_sec": self.processed / elapsed if elapsed else 0.0,
+            "backpressure_waits": float(self.backpressure_waits),
+            "signals": float(len(self.signals)),
+        }
+
+
+def benchmark_stream(n_symbols: int = 500, n_bars: int = 120, speedup: Optional[float] = 1200.0) -> Dict[str, float]:
+    """
+    Replay 1m sintetis seluruh universe (default 1 menit = 50 ms) dan ukur
+    latensi tick-to-signal. `speedup=None` mengukur throughput maksimum; pada
+    mode itu latensi didominasi antrean penuh.
+    """
+    from synthetic_market import generate_universe
+
+    market = generate_universe([f"STR{i:04d}" for i in range(n_symbols)], n_bars, freq="1min")
+    frames = {sym: market.frame(sym) for sym in market.symbols}
+    alerts = [AlertRule(sym, float(market.close[i, 0]) * 1.01) for i, sym in enumerate(market.symbols)]
+    engine = StreamEngine(ReplaySource(frames, speedup=speedup), alerts=alerts)
+    return asyncio.run(engine.run())
+
+
+if __name__ == "__main__":
+    print(benchmark_stream())
@@ -0,0 +1,311 @@
+"""
+Generator pasar sintetis yang deterministik & tervektorisasi.
+
+Dipakai sebagai fallback data (saat yfinance/store tidak tersedia) dan untuk
+load test engine. Berbeda dengan `hash(symbol)` bawaan Python yang diacak per
+proses oleh PYTHONHASHSEED, seed di sini diturunkan dari SHA-256 sehingga
+emiten yang sama menghasilkan data identik di semua worker dan bisa di-cache
+bersama.
+
+Model harga (log-return per bar):
+    r = sigma * (beta_m * M + beta_s * S_sektor + sqrt(1 - beta_m^2 - beta_s^2) * e)
+- M: faktor pasar (IHSG), S_sektor: faktor per sektor, e: idiosinkratik emiten.
+- Volume mengikuti rezim rendah/tinggi (proses switching yang "lengket") dan
+  membesar saat |return| besar.
+
+Setiap komponen di-seed per (komponen, chunk waktu), jadi data satu emiten
+tidak bergantung pada emiten lain di universe dan data panjang bisa dibuat
+per chunk (lihat `iter_universe`) tanpa memuat semuanya ke RAM.
+
+`sigma` adalah volatilitas harian; untuk bar intraday/mingguan diskalakan
+dengan akar panjang bar (dalam hari bursa), volume dengan panjang bar.
+`synthetic_ohlcv` membangkitkan seri harian dari epoch tetap lalu memotong
+per tanggal, jadi harga suatu tanggal tidak bergantung pada awal jendela.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from dummy_data import IDX_STOCKS
+
+CHUNK_BARS = 4096
+SYNTHETIC_EPOCH = pd.Timestamp("2000-01-03")
+SESSION_START = pd.Timedelta(hours=9)
+SESSION_MINUTES = 300  # perkiraan durasi sesi BEI per hari
+
+_BETA_MARKET = 0.45
+_BETA_SECTOR = 0.35
+_VOLUME_REGIME_MULT = 3.0
+_REGIME_SWITCH_P = 0.02
+
+
+def stable_seed(*parts: Any) -> int:
+    """Seed 64-bit yang stabil lintas proses/mesin dari gabungan `parts`."""
+    key = "|".join(str(p) for p in parts).encode("utf-8")
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "little")
+
+
+def _rng(*parts: Any) -> np.random.Generator:
+    return np.random.default_rng(stable_seed(*parts))
+
+
+def _normalize(symbol: str) -> str:
+    return symbol.strip().upper().removesuffix(".JK")
+
+
+def sector_of(symbol: str) -> str:
+    return IDX_STOCKS.get(_normalize(symbol), {}).get("sector", "Other")
+
+
+@dataclass
+class SyntheticMarket:
+    """Matriks OHLCV emiten × waktu (float32 harga, int64 volume)."""
+
+    symbols: List[str]
+    index: pd.DatetimeIndex
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.open, self.high, self.low, self.close, self.volume))
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """DataFrame OHLCV satu emiten (format `get_price_data`)."""
+        i = self.symbols.index(_normalize(symbol))
+        return pd.DataFrame(
+            {
+                "Open": self.open[i].astype(np.float64),
+                "High": self.high[i].astype(np.float64),
+                "Low": self.low[i].astype(np.float64),
+                "Close": self.close[i].astype(np.float64),
+                "Volume": self.volume[i],
+            },
+            index=self.index,
+        )
+
+
+def bar_days(freq: str) -> float:
+    """Panjang satu bar `freq` dalam hari bursa (mis. "1min" -> 1/300, "B" -> 1, "W" -> 5)."""
+    offset = pd.tseries.frequencies.to_offset(freq)
+    try:
+        minutes = pd.Timedelta(offset).total_seconds() / 60.0
+    except (TypeError, ValueError):
+        minutes = None
+    if minutes is not None:
+        return minutes / SESSION_MINUTES if minutes < 1440 else minutes / 1440
+    code = offset.rule_code.upper()
+    per_unit = 5 if code.startswith("W") else 21 if code.startswith(("M", "BM")) else 63 if code.startswith(("Q", "BQ")) else 252 if code.startswith(("Y", "A", "BY", "BA")) else 1
+    return float(per_unit * offset.n)
+
+
+def _date_index(start: Any, periods: int, freq: str) -> pd.DatetimeIndex:
+    """`pd.date_range`, dengan jalur cepat NumPy untuk hari bursa ("B")."""
+    if freq == "B":
+        start = pd.Timestamp(start)
+        days = np.busday_offset(start.date(), np.arange(periods), roll="forward")
+        return pd.DatetimeIndex(days.astype("datetime64[ns]") + (start - start.normalize()).to_timedelta64())
+    return pd.date_range(start=start, periods=periods, freq=freq)
+
+
+def _symbol_params(symbols: Sequence[str], seed: int) -> Dict[str, np.ndarray]:
+    """Parameter statis per emiten: harga awal, volatilitas, volume dasar."""
+    n = len(symbols)
+    out = {k: np.empty(n) for k in ("price0", "sigma", "vol0")}
+    for i, sym in enumerate(symbols):
+        u = _rng("params", seed, sym).random(3)
+        out["price0"][i] = np.exp(np.log(200) + u[0] * np.log(150))  # ~Rp 200 - 30.000
+        out["sigma"][i] = 0.01 + 0.02 * u[1]
+        out["vol0"][i] = np.exp(np.log(2e5) + u[2] * np.log(100))
+    return out
+
+
+def _chunk(
+    symbols: Sequence[str],
+    sectors: Sequence[str],
+    n: int,
+    chunk_id: int,
+    seed: int,
+    params: Dict[str, np.ndarray],
+    state: Dict[str, np.ndarray],
+    days: float = 1.0,
+) -> Dict[str, np.ndarray]:
+    """Bangkitkan satu chunk `n` bar untuk seluruh universe; `state` diperbarui in-place."""
+    n_sym = len(symbols)
+    market = _rng("market", seed, chunk_id).standard_normal(n)
+    sector_names = sorted(set(sectors))
+    sector_f = {s: _rng("sector", seed, s, chunk_id).standard_normal(n) for s in sector_names}
+    sector_mat = np.stack([sector_f[s] for s in sectors])
+
+    idio = np.empty((n_sym, n))
+    aux = np.empty((n_sym, 4, n))
+    for i, sym in enumerate(symbols):
+        g = _rng("idio", seed, sym, chunk_id)
+        idio[i] = g.standard_normal(n)
+        aux[i] = g.random((4, n))
+
+    beta_i = np.sqrt(1.0 - _BETA_MARKET**2 - _BETA_SECTOR**2)
+    z = _BETA_MARKET * market[None, :] + _BETA_SECTOR * sector_mat + beta_i * idio
+    sigma = params["sigma"][:, None] * np.sqrt(days)
+    log_ret = sigma * z - 0.5 * sigma**2
+
+    log_close = state["log_close"][:, None] + np.cumsum(log_ret, axis=1)
+    prev_close = np.concatenate([state["log_close"][:, None], log_close[:, :-1]], axis=1)
+    gap = sigma * 0.3 * (aux[:, 0] - 0.5)
+    log_open = prev_close + gap
+    body_hi = np.maximum(log_open, log_close)
+    body_lo = np.minimum(log_open, log_close)
+    high = np.exp(body_hi + sigma * 0.5 * aux[:, 1])
+    low = np.exp(body_lo - sigma * 0.5 * aux[:, 2])
+
+    switches = aux[:, 3] < _REGIME_SWITCH_P
+    regime = (state["regime"][:, None] + np.cumsum(switches, axis=1)) % 2
+    activity = 1.0 + np.abs(z)
+    volume = params["vol0"][:, None] * days * np.where(regime == 1, _VOLUME_REGIME_MULT, 1.0) * activity
+
+    state["log_close"] = log_close[:, -1].copy()
+    state["regime"] = regime[:, -1].copy()
+    return {
+        "open": np.exp(log_open).astype(np.float32),
+        "high": high.astype(np.float32),
+        "low": low.astype(np.float32),
+        "close": np.exp(log_close).astype(np.float32),
+        "volume": volume.astype(np.int64),
+    }
+
+
+def iter_universe(
+    symbols: Sequence[str],
+    n_bars: int,
+    start: str = "2020-01-01",
+    freq: str = "B",
+    seed: int = 0,
+    sectors: Optional[Dict[str, str]] = None,
+) -> Iterator[SyntheticMarket]:
+    """
+    Hasilkan universe per chunk `CHUNK_BARS` bar (harga & rezim volume
+    bersambung antar chunk). Cocok untuk load test jutaan bar.
+    """
+    syms = [_normalize(s) for s in symbols]
+    sect = [(sectors or {}).get(s) or sector_of(s) for s in syms]
+    params = _symbol_params(syms, seed)
+    state = {"log_close": np.log(params["price0"]), "regime": np.zeros(len(syms), dtype=np.int64)}
+    index = _date_index(start, n_bars, freq)
+    days = bar_days(freq)
+
+    for chunk_id, lo in enumerate(range(0, n_bars, CHUNK_BARS)):
+        hi = min(lo + CHUNK_BARS, n_bars)
+        cols = _chunk(syms, sect, hi - lo, chunk_id, seed, params, state, days)
+        yield SyntheticMarket(symbols=syms, index=index[lo:hi], **cols)
+
+
+def generate_universe(
+    symbols: Sequence[str],
+    n_bars: int,
+    start: str = "2020-01-01",
+    freq: str = "B",
+    seed: int = 0,
+    sectors: Optional[Dict[str, str]] = None,
+) -> SyntheticMarket:
+    """Bangkitkan OHLCV berkorelasi untuk seluruh `symbols` dalam satu panggilan."""
+    chunks = list(iter_universe(symbols, n_bars, start=start, freq=freq, seed=seed, sectors=sectors))
+    if not chunks:
+        empty = np.empty((len(symbols), 0), dtype=np.float32)
+        return SyntheticMarket(
+            symbols=[_normalize(s) for s in symbols],
+            index=pd.DatetimeIndex([]),
+            open=empty, high=empty, low=empty, close=empty,
+            volume=np.empty((len(symbols), 0), dtype=np.int64),
+        )
+    if len(chunks) == 1:
+        return chunks[0]
+    return SyntheticMarket(
+        symbols=chunks[0].symbols,
+        index=pd.DatetimeIndex(np.concatenate([c.index.values for c in chunks])),
+        **{
+            col: np.concatenate([getattr(c, col) for c in chunks], axis=1)
+            for col in ("open", "high", "low", "close", "volume")
+        },
+    )
+
+
+def _frame_at(market: SyntheticMarket, symbol: str, positions: np.ndarray, index: pd.DatetimeIndex) -> pd.DataFrame:
+    df = market.frame(symbol).iloc[positions]
+    df.index = index
+    return df
+
+
+def synthetic_ohlcv(symbol: str, index: pd.DatetimeIndex, seed: int = 0, freq: Optional[str] = None) -> pd.DataFrame:
+    """
+    OHLCV sintetis satu emiten pada `index` (fallback `get_price_data`).
+
+    - Bar harian/lebih panjang: seri dibangkitkan dari `SYNTHETIC_EPOCH`, lalu
+      tiap timestamp diambil dari bar terakhir pada/sebelum tanggalnya.
+    - Bar intraday: tiap tanggal punya sesi sendiri (seed per tanggal) yang
+      diskalakan agar dibuka dari close harian hari bursa sebelumnya.
+    """
+    index = pd.DatetimeIndex(index)
+    if len(index) == 0:
+        return generate_universe([symbol], 0).frame(symbol).set_axis(index)
+    freq = freq or index.freqstr or pd.infer_freq(index) or "B"
+    days = bar_days(freq)
+    dates = index.normalize()
+
+    daily_freq = freq if days >= 1 else "B"
+    if daily_freq == "B":
+        n_days = int(np.busday_count(SYNTHETIC_EPOCH.date(), dates.max().date())) + 1
+        calendar = _date_index(SYNTHETIC_EPOCH, max(n_days, 1), "B")
+    else:
+        calendar = pd.date_range(SYNTHETIC_EPOCH, max(dates.max(), SYNTHETIC_EPOCH), freq=daily_freq)
+    daily = generate_universe([symbol], len(calendar), start=SYNTHETIC_EPOCH, freq=daily_freq, seed=seed)
+    day_pos = np.clip(calendar.searchsorted(dates, side="right") - 1, 0, None)
+    if days >= 1:
+        return _frame_at(daily, symbol, day_pos, index)
+
+    parts = []
+    bar_len = pd.Timedelta(pd.tseries.frequencies.to_offset(freq))
+    for day in dates.unique():
+        mask = dates == day
+        pos = np.clip(((index[mask] - day - SESSION_START) // bar_len).to_numpy(), 0, None).astype(np.int64)
+        session = generate_universe(
+            [symbol], int(pos.max()) + 1, start=day + SESSION_START, freq=freq,
+            seed=stable_seed(seed, "intraday", day.date()),
+        )
+        prev = calendar.searchsorted(day, side="left") - 1
+        anchor = float(daily.close[0, max(prev, 0)])
+        scale = np.float32(anchor / float(session.open[0, 0]))
+        for col in ("open", "high", "low", "close"):
+            getattr(session, col)[:] *= scale
+        parts.append(_frame_at(session, symbol, pos, index[mask]))
+    return pd.concat(parts).loc[index]
+
+
+def benchmark_generation(n_symbols: int = 1000, n_bars: int = 100_000) -> Dict[str, float]:
+    """Ukur throughput generator (bar emiten per detik) secara streaming per chunk."""
+    symbols = [f"SYN{i:05d}" for i in range(n_symbols)]
+    t0 = time.perf_counter()
+    peak = 0
+    for chunk in iter_universe(symbols, n_bars, freq="1min"):
+        peak = max(peak, chunk.nbytes)
+    elapsed = time.perf_counter() - t0
+    return {
+        "symbols": n_symbols,
+        "bars": n_bars,
+        "seconds": elapsed,
+        "symbol_bars_per_sec": n_symbols * n_bars / elapsed,
+        "peak_chunk_mb": peak / 1e6,
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark_generation(200, 200_000))
@@ -1,7 +1,12 @@
 import datetime
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
+
+from indicator_kernels import bollinger_multi, ema_multi, macd_multi, rsi_multi
+from ohlcv_store import OHLCVSlice, OHLCVStore
+from resampling import PYRAMID_CACHE, OHLCVPyramid
+from synthetic_market import stable_seed, synthetic_ohlcv
 
 try:
     import talib
@@ -28,75 +33,123 @@ try:
 except Exception:
     pulp = None
 
-def get_price_data(
-    symbol: str, 
-    timeframe: str, 
+# Umur maksimum (detik) piramida harga di PYRAMID_CACHE
+PRICE_CACHE_TTL = 300.0
+
+def get_price_pyramid(
+    symbol: str,
     period_days: int = 365,
-) -> pd.DataFrame:
-    """Ambil data harga (yfinance + fallback dummy)."""
+    store: Optional[OHLCVStore] = None,
+    use_cache: bool = True,
+    cache_ttl: float = PRICE_CACHE_TTL,
+) -> OHLCVPyramid:
+    """
+    Ambil piramida harga 15min/1h/1D/1W (store memmap lokal -> yfinance -> fallback dummy).
+
+    Jika `store` diberikan dan memuat emiten, hanya rentang `period_days`
+    terakhir yang dibaca dari memmap; histori penuh tidak pernah dimuat.
+    Dengan `use_cache=True` piramida di-cache di PYRAMID_CACHE per slot waktu
+    `cache_ttl` detik; dengan `use_cache=False` cache tidak dibaca maupun diisi
+    (pemanggil mengelola cache sendiri, mis. `DataService`). Fallback dummy hanya
+    di-cache jika yfinance memang tidak terpasang; kegagalan fetch sesaat dicoba
+    ulang pada panggilan berikutnya.
+    """
     end = datetime.datetime.today()
     start = end - datetime.timedelta(days=period_days)
     idx_symbol = symbol.strip().upper()
     yf_symbol = idx_symbol if idx_symbol.endswith(".JK") else f"{idx_symbol}.JK"
-    
-    df: Optional[pd.DataFrame] = None
-    if yf is not None:
-        try:
-            data = yf.download(yf_symbol, start=start, end=end, progress=False, auto_adjust=True)
-            if not data.empty:
-                # Ensure it's a 1D dataframe and columns are simple
-                if isinstance(data.columns, pd.MultiIndex):
-                    data.columns = data.columns.get_level_values(0)
-                df = data.rename(columns=str.capitalize)
-        except Exception:
-            df = None
-
-    if df is None or df.empty:
-        dates = pd.date_range(start=start, end=end, freq="B")
-        n = len(dates)
-        rng = np.random.default_rng(abs(hash(symbol)) % (2**32))
-        prices = 10000 + np.cumsum(rng.normal(0, 100, size=n))
-        prices = np.maximum(prices, 500)
-        df = pd.DataFrame({
-            "Open": prices * (1 + rng.normal(0, 0.002, size=n)),
-            "High": prices * (1 + rng.normal(0.005, 0.003, size=n)),
-            "Low": prices * (1 - rng.normal(0.005, 0.003, size=n)),
-            "Close": prices,
-            "Volume": rng.integers(1e5, 5e6, size=n),
-        }, index=dates)
-
-    rule = {"1m": "15min", "1h": "1H", "1d": "1D", "1w": "1W"}.get(timeframe, "1D")
-    return df.resample(rule).last().dropna()
-
-def compute_indicators(df: pd.DataFrame, rsi_period=14, ema_period=20, bb_period=20) -> pd.DataFrame:
-    """Hitung RSI, EMA, Bollinger Bands, MACD."""
-    close = df["Close"]
-    
+
+    bucket = int(end.timestamp() // cache_ttl) if cache_ttl > 0 else end.timestamp()
+    cache_key = (idx_symbol, period_days, store.root if store is not None else None, bucket)
+    if use_cache:
+        pyramid = PYRAMID_CACHE.get(cache_key)
+        if pyramid is not None:
+            return pyramid
+
+    pyramid: Optional[OHLCVPyramid] = None
+    cacheable = use_cache
+    if store is not None and idx_symbol.removesuffix(".JK") in store:
+        sl = store.read_range(idx_symbol.removesuffix(".JK"), start, end)
+        if not sl.empty:
+            pyramid = OHLCVPyramid.build_from_slice(sl)
+
+    if pyramid is None:
+        df: Optional[pd.DataFrame] = None
+        if yf is not None:
+            try:
+                data = yf.download(yf_symbol, start=start, end=end, progress=False, auto_adjust=True)
+                if not data.empty:
+                    # Ensure it's a 1D dataframe and columns are simple
+                    if isinstance(data.columns, pd.MultiIndex):
+                        data.columns = data.columns.get_level_values(0)
+                    df = data.rename(columns=str.capitalize)
+            except Exception:
+                df = None
+
+        if df is None or df.empty:
+            dates = pd.date_range(start=start.date(), end=end.date(), freq="B")
+            df = synthetic_ohlcv(idx_symbol, dates)
+            cacheable = cacheable and yf is None
+        pyramid = OHLCVPyramid.build(df)
+
+    if cacheable:
+        PYRAMID_CACHE.put(cache_key, pyramid)
+    return pyramid
+
+def get_price_data(
+    symbol: str, 
+    timeframe: str, 
+    period_days: int = 365,
+    store: Optional[OHLCVStore] = None,
+    use_cache: bool = True,
+    cache_ttl: float = PRICE_CACHE_TTL,
+) -> pd.DataFrame:
+    """
+    Ambil data harga satu timeframe dari `get_price_pyramid`.
+
+    Piramida di-cache per slot waktu `cache_ttl` detik, jadi ganti timeframe
+    tidak memicu fetch/resample ulang.
+    """
+    pyramid = get_price_pyramid(symbol, period_days, store=store, use_cache=use_cache, cache_ttl=cache_ttl)
+    return pyramid.get(timeframe).copy()
+
+def compute_indicators(df: Union[pd.DataFrame, OHLCVSlice], rsi_period=14, ema_period=20, bb_period=20) -> pd.DataFrame:
+    """
+    Hitung RSI, EMA, Bollinger Bands, MACD (input DataFrame atau slice `OHLCVStore`).
+
+    Untuk slice, indikator dihitung langsung dari kolom `close` memmap dan
+    DataFrame hanya dibangun untuk baris setelah lookback.
+    """
+    is_slice = isinstance(df, OHLCVSlice)
+    close = np.asarray(df.close if is_slice else df["Close"], dtype=np.float64)
+
     if talib is not None:
         rsi = talib.RSI(close, timeperiod=rsi_period)
         ema = talib.EMA(close, timeperiod=ema_period)
         upper, middle, lower = talib.BBANDS(close, timeperiod=bb_period, nbdevup=2, nbdevdn=2)
         macd, macd_signal, _ = talib.MACD(close)
     else:
-        # Fallback manual
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(rsi_period).mean()
-        rs = gain / (loss + 1e-9)
-        rsi = 100 - (100 / (1 + rs))
-        ema = close.ewm(span=ema_period, adjust=False).mean()
-        mid = close.rolling(bb_period).mean()
-        std = close.rolling(bb_period).std()
-        upper, middle, lower = mid + 2*std, mid, mid - 2*std
-        m_fast = close.ewm(span=12).mean()
-        m_slow = close.ewm(span=26).mean()
-        macd = m_fast - m_slow
-        macd_signal = macd.ewm(span=9).mean()
-
-    df_ind = df.copy()
-    df_ind["RSI"], df_ind["EMA"] = rsi, ema
-    df_ind["BB_upper"], df_ind["BB_middle"], df_ind["BB_lower"] = upper, middle, lower
-    df_ind["MACD"], df_ind["MACD_signal"] = macd, macd_signal
+        # Fallback NumPy dengan seeding/smoothing identik TA-Lib (RSI Wilder)
+        rsi = rsi_multi(close, rsi_period)[0, 0]
+        ema = ema_multi(close, ema_period)[0, 0]
+        upper, middle, lower = (b[0, 0] for b in bollinger_multi(close, bb_period))
+        macd, macd_signal, _ = (m[0, 0] for m in macd_multi(close))
+
+    indicators = {
+        "RSI": rsi, "EMA": ema,
+        "BB_upper": upper, "BB_middle": middle, "BB_lower": lower,
+        "MACD": macd, "MACD_signal": macd_signal,
+    }
+    if is_slice:
+        ready = np.flatnonzero(np.isfinite(np.vstack(list(indicators.values()))).all(axis=0))
+        start = int(ready[0]) if ready.size else len(close)
+        df_ind = df.slice_rows(start).to_frame()
+        for col, values in indicators.items():
+            df_ind[col] = values[start:]
+    else:
+        df_ind = df.copy()
+        for col, values in indicators.items():
+            df_ind[col] = values
     return df_ind.dropna()
 
 def simple_backtest(df: pd.DataFrame, initial_capital: float, risk_pct: float) -> Dict[str, float]:
@@ -139,7 +192,7 @@ def simple_backtest(df: pd.DataFrame, initial_capital: float, risk_pct: float) -
 
 def compute_fundamental_dummy(symbol: str, sector: str) -> Dict[str, float]:
     base_pe = {"Banking": 15, "Mining": 10, "Energy": 12, "Telecommunications": 18, "Consumer": 20}.get(sector, 15)
-    rng = np.random.default_rng(abs(hash(symbol)) % (2**32))
+    rng = np.random.default_rng(stable_seed("fundamental", symbol))
     return {
         "pe": round(float(base_pe + rng.normal(0, 2)), 2),
         "sector_pe_avg": float(base_pe),
@@ -149,7 +202,7 @@ def compute_fundamental_dummy(symbol: str, sector: str) -> Dict[str, float]:
     }
 
 def compute_sentiment_dummy(symbol: str) -> Dict[str, float]:
-    rng = np.random.default_rng(abs(hash(symbol + "s")) % (2**32))
+    rng = np.random.default_rng(stable_seed("sentiment", symbol))
     pos, hype = rng.random(), rng.random()
     return {
         "positive_news": round(pos * 100, 1),